@@ -31,7 +31,7 @@ from agents.models.openai_responses import OpenAIResponsesModel
 
 from azure_client import client_manager
 from config import settings
-from workflow_status import create_tool_status_hooks
+from workflow_status import create_tool_status_hooks, tool_status_tracking
 
 logger = logging.getLogger(__name__)
 
@@ -201,41 +201,45 @@ class BaseChatKitServer(ChatKitServer):
         hooks, tracker = create_tool_status_hooks(agent_context)
         
         # Run the agent with streaming and tool status hooks
-        result = Runner.run_streamed(
-            agent,
-            agent_input,
-            context=agent_context,
-            hooks=hooks,
-            run_config=RunConfig(model=azure_model),
-        )
+        with tool_status_tracking(tracker):
+            result = Runner.run_streamed(
+                agent,
+                agent_input,
+                context=agent_context,
+                hooks=hooks,
+                run_config=RunConfig(model=azure_model),
+            )
         
         # Stream the agent response back to the client
         async for event in stream_agent_response(agent_context, result):
-            event_type = type(event).__name__
-            # Log more details about the event content
-            if hasattr(event, 'item'):
-                item = event.item
-                item_id = getattr(item, 'id', 'unknown')
-                if hasattr(item, 'content') and item.content:
-                    # Log first content item for debugging
-                    first_content = item.content[0] if item.content else None
-                    if first_content and hasattr(first_content, 'text'):
-                        text_preview = first_content.text[:50] if first_content.text else ''
-                        logger.info(f"Streaming event: {event_type}, id={item_id}, text preview: {text_preview}...")
+            # Building the log line inspects the event, so skip it entirely
+            # when INFO logging is off
+            if logger.isEnabledFor(logging.INFO):
+                event_type = type(event).__name__
+                # Log more details about the event content
+                if hasattr(event, 'item'):
+                    item = event.item
+                    item_id = getattr(item, 'id', 'unknown')
+                    if hasattr(item, 'content') and item.content:
+                        # Log first content item for debugging
+                        first_content = item.content[0] if item.content else None
+                        if first_content and hasattr(first_content, 'text'):
+                            text_preview = first_content.text[:50] if first_content.text else ''
+                            logger.info("Streaming event: %s, id=%s, text preview: %s...", event_type, item_id, text_preview)
+                        else:
+                            logger.info("Streaming event: %s, id=%s, content type: %s", event_type, item_id, type(first_content).__name__ if first_content else 'None')
                     else:
-                        logger.info(f"Streaming event: {event_type}, id={item_id}, content type: {type(first_content).__name__ if first_content else 'None'}")
+                        logger.info("Streaming event: %s, id=%s, item type: %s", event_type, item_id, type(item).__name__)
                 else:
-                    logger.info(f"Streaming event: {event_type}, id={item_id}, item type: {type(item).__name__}")
-            else:
-                logger.info(f"Streaming event: {event_type}")
+                    logger.info("Streaming event: %s", event_type)
             yield event
         
         # End the workflow status indicator if it was started
-        tracker.end_workflow_if_started()
+        await tracker.end_workflow_if_started()
         
         # Call the post-respond hook for additional events (e.g., widgets)
         async for event in self.post_respond_hook(thread, agent_context):
-            logger.info(f"Post-respond hook event: {type(event).__name__}")
+            logger.info("Post-respond hook event: %s", type(event).__name__)
             yield event
     
     async def stream_widget_to_client(
@@ -254,5 +258,5 @@ class BaseChatKitServer(ChatKitServer):
             Widget-related ThreadStreamEvent objects
         """
         async for event in stream_widget(thread, widget):
-            logger.debug(f"Streaming widget event: {event.type}")
+            logger.debug("Streaming widget event: %s", event.type)
             yield event
@@ -7,6 +7,10 @@ This ensures consistency between the application, scripts, and data population t
 Environment Variables (optional overrides):
     COSMOS_ENDPOINT - Override the default Cosmos DB endpoint
     COSMOS_DATABASE - Override the default database name
+    COSMOS_PREFERRED_REGIONS - Comma-separated Azure regions to route requests to, nearest first
+    COSMOS_CONSISTENCY_LEVEL - Per-client consistency (e.g. "Session"); defaults to the account level
+    COSMOS_RETRY_TOTAL - Maximum retries for a failed/throttled request (default 3)
+    COSMOS_RETRY_BACKOFF_MAX - Maximum retry backoff in seconds (default 2)
 """
 
 import os
@@ -25,6 +29,23 @@ DATABASE_NAME = os.getenv(
     "db001"
 )
 
+# =============================================================================
+# COSMOS DB CONNECTION POLICY
+# =============================================================================
+
+# Route reads/writes to the nearest replica instead of the account's write region
+COSMOS_PREFERRED_REGIONS = [
+    region.strip()
+    for region in os.getenv("COSMOS_PREFERRED_REGIONS", "").split(",")
+    if region.strip()
+]
+
+COSMOS_CONSISTENCY_LEVEL = os.getenv("COSMOS_CONSISTENCY_LEVEL", "")
+
+# Bounded retries so a throttled request can't stall a user-facing call for long
+COSMOS_RETRY_TOTAL = int(os.getenv("COSMOS_RETRY_TOTAL", "3"))
+COSMOS_RETRY_BACKOFF_MAX = int(os.getenv("COSMOS_RETRY_BACKOFF_MAX", "2"))
+
 # =============================================================================
 # RETAIL DATA CONTAINERS
 # =============================================================================
@@ -71,6 +92,19 @@ def get_retail_container_name(logical_name: str) -> str:
     return logical_name
 
 
+def get_cosmos_client_options() -> dict:
+    """Get keyword arguments for CosmosClient applying the connection policy above."""
+    options = {
+        "retry_total": COSMOS_RETRY_TOTAL,
+        "retry_backoff_max": COSMOS_RETRY_BACKOFF_MAX,
+    }
+    if COSMOS_PREFERRED_REGIONS:
+        options["preferred_locations"] = COSMOS_PREFERRED_REGIONS
+    if COSMOS_CONSISTENCY_LEVEL:
+        options["consistency_level"] = COSMOS_CONSISTENCY_LEVEL
+    return options
+
+
 def get_retail_container_config(logical_name: str) -> tuple:
     """Get (container_name, partition_key_path) for a retail container."""
     if logical_name in RETAIL_CONTAINERS:
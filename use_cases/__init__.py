@@ -20,6 +20,7 @@ from use_cases.retail import (
     RetailCosmosClient,
     CosmosDBStore,
     RETAIL_TOOLS,
+    RETAIL_TOOLS_JSON,
 )
 
 __all__ = [
@@ -28,5 +29,6 @@ __all__ = [
     "RetailCosmosClient",
     "CosmosDBStore",
     "RETAIL_TOOLS",
+    "RETAIL_TOOLS_JSON",
 ]
 
@@ -8,6 +8,7 @@ Components:
 - RetailChatKitServer: Main ChatKit server for the returns flow
 - RetailCosmosClient: Cosmos DB data access
 - RETAIL_TOOLS: AI function tools for the returns process
+- ReturnSessionContext: Per-thread state shared by widget actions and agent tools
 - Widgets: Rich UI components for the returns flow
 
 Sample Data includes:
@@ -34,7 +35,10 @@ from use_cases.retail.cosmos_client import RetailCosmosClient, get_retail_client
 from use_cases.retail.cosmos_store import CosmosDBStore
 
 # Import tools
-from use_cases.retail.tools import RETAIL_TOOLS, execute_tool
+from use_cases.retail.tools import RETAIL_TOOLS, RETAIL_TOOLS_JSON, execute_tool
+
+# Import session context
+from use_cases.retail.session_context import ReturnSessionContext, ReturnFlowStep
 
 __all__ = [
     # Server
@@ -45,5 +49,9 @@ __all__ = [
     "CosmosDBStore",
     # Tools
     "RETAIL_TOOLS",
+    "RETAIL_TOOLS_JSON",
     "execute_tool",
+    # Session context
+    "ReturnSessionContext",
+    "ReturnFlowStep",
 ]
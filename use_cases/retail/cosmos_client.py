@@ -6,7 +6,9 @@ Uses DefaultAzureCredential for flexible authentication.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime, timedelta, timezone
 
 from azure.cosmos import CosmosClient
@@ -18,10 +20,14 @@ from shared.cosmos_config import (
     COSMOS_ENDPOINT,
     DATABASE_NAME,
     RETAIL_CONTAINER_NAMES,
+    get_cosmos_client_options,
 )
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent product point reads
+PRODUCT_FETCH_MAX_WORKERS = 16
+
 
 class RetailCosmosClient:
     """Client for accessing retail data in Cosmos DB."""
@@ -33,7 +39,11 @@ class RetailCosmosClient:
             exclude_interactive_browser_credential=False,
             exclude_shared_token_cache_credential=False,
         )
-        self._client = CosmosClient(COSMOS_ENDPOINT, credential=self._credential)
+        self._client = CosmosClient(
+            COSMOS_ENDPOINT,
+            credential=self._credential,
+            **get_cosmos_client_options(),
+        )
         self._database = self._client.get_database_client(DATABASE_NAME)
         self._containers = {}
         logger.info("Retail Cosmos DB client initialized")
@@ -111,23 +121,38 @@ class RetailCosmosClient:
         except CosmosResourceNotFoundError:
             return None
 
-    def get_returnable_orders(self, customer_id: str) -> List[Dict[str, Any]]:
-        """Get orders with items that can still be returned (within return window)."""
-        orders = self.get_orders_for_customer(customer_id)
+    def get_returnable_orders(
+        self, customer_id: str, orders: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get orders with items that can still be returned (within return window).
+        
+        Args:
+            customer_id: Customer whose orders to check
+            orders: Already-fetched orders for the customer; queried if omitted.
+                These are not modified (returnable entries are copies).
+        """
+        if orders is None:
+            orders = self.get_orders_for_customer(customer_id)
+        candidates = [o for o in orders if o.get("status") in ("delivered", "shipped")]
+        
+        # Each item needs its product twice (eligibility and name), so fetch
+        # every distinct product once, concurrently, up front
+        products = self.get_products_by_ids(
+            {item.get("product_id", "") for order in candidates for item in order.get("items", [])}
+        )
         returnable = []
         
-        for order in orders:
-            if order.get("status") not in ["delivered", "shipped"]:
-                continue
-            
+        for order in candidates:
             returnable_items = []
             for item in order.get("items", []):
-                eligibility = self.check_item_return_eligibility(order, item)
+                eligibility = self.check_item_return_eligibility(order, item, products)
                 if eligibility["eligible"]:
                     item_copy = item.copy()
                     item_copy["return_eligibility"] = eligibility
                     # Enrich with product name from catalog
-                    product = self.get_product_by_id(item.get("product_id", ""))
+                    product_id = item.get("product_id", "")
+                    product = products[product_id] if product_id in products else self.get_product_by_id(product_id)
                     if product:
                         item_copy["name"] = product.get("name", "Unknown Product")
                         item_copy["category"] = product.get("category", "")
@@ -143,12 +168,27 @@ class RetailCosmosClient:
         return returnable
 
     def check_item_return_eligibility(
-        self, order: Dict[str, Any], item: Dict[str, Any]
+        self,
+        order: Dict[str, Any],
+        item: Dict[str, Any],
+        products: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
     ) -> Dict[str, Any]:
-        """Check if an item is eligible for return."""
+        """
+        Check if an item is eligible for return.
+        
+        Args:
+            order: The order containing the item
+            item: The order line item
+            products: Prefetched products by id (see get_products_by_ids);
+                products not in it are read from the container
+        """
         try:
             # Get product details
-            product = self.get_product_by_id(item.get("product_id", ""))
+            product_id = item.get("product_id", "")
+            if products is not None and product_id in products:
+                product = products[product_id]
+            else:
+                product = self.get_product_by_id(product_id)
             if not product:
                 # If product not found, assume 30-day return window
                 logger.warning(f"Product {item.get('product_id')} not found, using default return window")
@@ -225,6 +265,28 @@ class RetailCosmosClient:
         except CosmosResourceNotFoundError:
             return None
 
+    def get_products_by_ids(self, product_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get several products concurrently.
+        
+        Point reads are I/O bound, so they run in a small thread pool.
+        Missing products map to None; products whose read failed are left
+        out so callers can retry them individually.
+        """
+        product_ids = [pid for pid in product_ids if pid]
+        if not product_ids:
+            return {}
+        
+        products: Dict[str, Optional[Dict[str, Any]]] = {}
+        executor = _get_product_fetch_executor()
+        futures = {pid: executor.submit(self.get_product_by_id, pid) for pid in product_ids}
+        for pid, future in futures.items():
+            try:
+                products[pid] = future.result()
+            except Exception as e:
+                logger.warning(f"Error fetching product {pid}: {e}")
+        return products
+
     def get_all_products(self) -> List[Dict[str, Any]]:
         """Get all products."""
         container = self._get_container("products")
@@ -284,6 +346,8 @@ class RetailCosmosClient:
             "refund_amount": return_data.get("refund_amount", 0),
         }
         
+        # Items are embedded in the return document, so the whole return is
+        # committed atomically in a single round-trip (no batch needed)
         container.create_item(return_record)
         return return_record
 
@@ -356,11 +420,38 @@ class RetailCosmosClient:
 
 # Singleton instance
 _client: Optional[RetailCosmosClient] = None
+_client_lock = threading.Lock()
 
 
 def get_retail_client() -> RetailCosmosClient:
-    """Get the singleton Cosmos DB client instance."""
+    """
+    Get the singleton Cosmos DB client instance.
+    
+    Tools run in worker threads (asyncio.to_thread), so creation is
+    guarded by a lock to make sure every caller shares one client and its
+    connection pool.
+    """
     global _client
     if _client is None:
-        _client = RetailCosmosClient()
+        with _client_lock:
+            if _client is None:
+                _client = RetailCosmosClient()
     return _client
+
+
+# Shared pool for concurrent product reads, so requests reuse its threads
+# instead of starting and tearing down a pool each time
+_product_fetch_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_product_fetch_executor() -> ThreadPoolExecutor:
+    """Get the shared product-read thread pool, creating it on first use."""
+    global _product_fetch_executor
+    if _product_fetch_executor is None:
+        with _client_lock:
+            if _product_fetch_executor is None:
+                _product_fetch_executor = ThreadPoolExecutor(
+                    max_workers=PRODUCT_FETCH_MAX_WORKERS,
+                    thread_name_prefix="product-fetch",
+                )
+    return _product_fetch_executor
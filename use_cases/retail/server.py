@@ -5,23 +5,25 @@ This is the ChatKit server for the retail order returns use case.
 It extends BaseChatKitServer and integrates all retail-specific components.
 """
 
+import asyncio
 import json
 import logging
 import os
+import sys
+from collections import OrderedDict
+from functools import partial
 from typing import Any, AsyncIterator, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from chatkit.server import ThreadStreamEvent
-from chatkit.store import ThreadMetadata, Page
+from chatkit.store import ThreadMetadata
 from chatkit.agents import stream_widget, AgentContext
 from chatkit.types import (
     ThreadItemUpdatedEvent, ThreadItemReplacedEvent, ThreadItemAddedEvent,
     ThreadItemDoneEvent, InferenceOptions,
     WidgetItem, WidgetRootUpdated,
-    AssistantMessageItem, AssistantMessageContent,
     UserMessageItem, UserMessageTextContent,
 )
-import uuid
 from chatkit.widgets import Card, Text, Box, Button, Row, Badge, Divider, Title, Spacer
 from chatkit.actions import ActionConfig
 
@@ -46,7 +48,9 @@ from .tools import (
     create_return_request,
     get_customer_return_history,
     calculate_refund_amount,
+    DEFAULT_ORDER_LIMIT,
 )
+from .session_context import ReturnSessionContext
 
 logger = logging.getLogger(__name__)
 
@@ -205,7 +209,7 @@ SAMPLE CUSTOMERS FOR TESTING:
 @function_tool(description_override="Look up a customer by name, email, or phone number. Use this when the customer identifies themselves.")
 async def tool_lookup_customer(ctx: RunContextWrapper["RetailContext"], search_term: str) -> str:
     """Look up a customer by name, email, or phone number."""
-    result = lookup_customer(search_term)
+    result = await asyncio.to_thread(lookup_customer, search_term)
     
     # Set context flags for widget display
     if result.get("found") and not result.get("multiple"):
@@ -217,13 +221,14 @@ async def tool_lookup_customer(ctx: RunContextWrapper["RetailContext"], search_t
         
         # Initialize or update session context for natural language understanding
         if not hasattr(ctx.context, '_session_context'):
-            ctx.context._session_context = {}
-        ctx.context._session_context["customer_id"] = customer_id
-        ctx.context._session_context["customer_name"] = customer.get("name", "")
-        ctx.context._session_context["customer_tier"] = customer.get("tier", "Standard")
+            ctx.context._session_context = ReturnSessionContext()
+        session = ctx.context._session_context
+        session.customer_id = customer_id
+        session.customer_name = customer.get("name", "")
+        session.customer_tier = customer.get("tier", "Standard")
         
         # Also automatically fetch returnable items for a smoother flow
-        returnable_result = get_returnable_items(customer_id)
+        returnable_result = await asyncio.to_thread(get_returnable_items, customer_id)
         if returnable_result.get("found"):
             orders = returnable_result.get("orders", [])
             item_count = sum(len(o.get("items", [])) for o in orders)
@@ -232,7 +237,7 @@ async def tool_lookup_customer(ctx: RunContextWrapper["RetailContext"], search_t
             ctx.context._current_customer_id = customer_id
             
             # Store displayed orders in session context for natural language references
-            ctx.context._session_context["displayed_orders"] = [
+            session.displayed_orders = [
                 {
                     "order_id": order.get("order_id"),
                     "order_date": order.get("order_date"),
@@ -258,15 +263,18 @@ async def tool_lookup_customer(ctx: RunContextWrapper["RetailContext"], search_t
         return result.get("message", "Customer not found")
 
 
-@function_tool(description_override="Get all orders for a customer. Use this after identifying the customer.")
-async def tool_get_customer_orders(ctx: RunContextWrapper["RetailContext"], customer_id: str) -> str:
-    """Get all orders for a customer."""
-    result = get_customer_orders(customer_id)
+@function_tool(description_override="Get a customer's most recent orders (20 by default). Use this after identifying the customer. Pass a larger limit only if the user asks about older orders.")
+async def tool_get_customer_orders(ctx: RunContextWrapper["RetailContext"], customer_id: str, limit: int = DEFAULT_ORDER_LIMIT) -> str:
+    """Get a customer's most recent orders."""
+    result = await asyncio.to_thread(get_customer_orders, customer_id, limit)
     
     if result.get("found"):
         orders = result.get("orders", [])
         ctx.context._show_orders_widget = True
         ctx.context._orders_data = orders
+        total = result.get("total_orders", len(orders))
+        if total > len(orders):
+            return f"Showing the {len(orders)} most recent of {total} orders for this customer."
         return f"Found {len(orders)} orders for this customer."
     else:
         return result.get("message", "No orders found")
@@ -278,14 +286,14 @@ async def tool_show_customer_profile(ctx: RunContextWrapper["RetailContext"]) ->
     Show the customer profile card widget for the currently identified customer.
     This is useful when the customer is already logged in and we want to display their info.
     """
-    session = getattr(ctx.context, '_session_context', {})
-    customer_id = session.get("customer_id")
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
+    customer_id = session.customer_id
     
     if not customer_id:
         return "No customer identified in session. Please look up the customer first."
     
     # Look up the full customer details
-    result = lookup_customer(session.get("customer_email", customer_id))
+    result = await asyncio.to_thread(lookup_customer, session.customer_email or customer_id)
     
     if result.get("found") and not result.get("multiple"):
         customer = result.get("customer", {})
@@ -300,7 +308,7 @@ async def tool_show_customer_profile(ctx: RunContextWrapper["RetailContext"]) ->
 @function_tool(description_override="Get items that are eligible for return for a customer. Shows orders with items still within the return window.")
 async def tool_get_returnable_items(ctx: RunContextWrapper["RetailContext"], customer_id: str) -> str:
     """Get items eligible for return."""
-    result = get_returnable_items(customer_id)
+    result = await asyncio.to_thread(get_returnable_items, customer_id)
     
     if result.get("found"):
         orders = result.get("orders", [])
@@ -316,7 +324,7 @@ async def tool_get_returnable_items(ctx: RunContextWrapper["RetailContext"], cus
 @function_tool(description_override="Check if a specific item from an order can be returned.")
 async def tool_check_return_eligibility(ctx: RunContextWrapper["RetailContext"], order_id: str, product_id: str) -> str:
     """Check return eligibility."""
-    result = check_return_eligibility(order_id, product_id)
+    result = await asyncio.to_thread(check_return_eligibility, order_id, product_id)
     if result.get("eligible"):
         return f"This item is eligible for return. You have {result.get('days_remaining', 0)} days remaining in the return window."
     else:
@@ -327,12 +335,12 @@ async def tool_check_return_eligibility(ctx: RunContextWrapper["RetailContext"],
 async def tool_get_return_reasons(ctx: RunContextWrapper["RetailContext"]) -> str:
     """Get return reasons."""
     # Check if return was already completed
-    session = getattr(ctx.context, '_session_context', {})
-    if session.get("return_completed"):
-        last_return_id = session.get("last_return_id", "unknown")
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
+    if session.return_completed:
+        last_return_id = session.last_return_id or "unknown"
         return f"A return has already been completed (Return ID: {last_return_id}). If you need to start a new return, please say 'start a new return'."
     
-    result = get_return_reasons()
+    result = await asyncio.to_thread(get_return_reasons)
     reasons = result.get("reasons", []) if isinstance(result, dict) else []
     if reasons:
         ctx.context._show_reasons_widget = True
@@ -345,12 +353,12 @@ async def tool_get_return_reasons(ctx: RunContextWrapper["RetailContext"]) -> st
 async def tool_get_resolution_options(ctx: RunContextWrapper["RetailContext"]) -> str:
     """Get resolution options."""
     # Check if return was already completed
-    session = getattr(ctx.context, '_session_context', {})
-    if session.get("return_completed"):
-        last_return_id = session.get("last_return_id", "unknown")
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
+    if session.return_completed:
+        last_return_id = session.last_return_id or "unknown"
         return f"A return has already been completed (Return ID: {last_return_id}). If you need to start a new return, please say 'start a new return'."
     
-    result = get_resolution_options()
+    result = await asyncio.to_thread(get_resolution_options)
     options = result.get("options", []) if isinstance(result, dict) else []
     if options:
         ctx.context._show_resolution_widget = True
@@ -363,12 +371,12 @@ async def tool_get_resolution_options(ctx: RunContextWrapper["RetailContext"]) -
 async def tool_get_shipping_options(ctx: RunContextWrapper["RetailContext"]) -> str:
     """Get shipping options."""
     # Check if return was already completed
-    session = getattr(ctx.context, '_session_context', {})
-    if session.get("return_completed"):
-        last_return_id = session.get("last_return_id", "unknown")
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
+    if session.return_completed:
+        last_return_id = session.last_return_id or "unknown"
         return f"A return has already been completed (Return ID: {last_return_id}). If you need to start a new return, please say 'start a new return'."
     
-    result = get_shipping_options()
+    result = await asyncio.to_thread(get_shipping_options)
     options = result.get("options", []) if isinstance(result, dict) else []
     if options:
         ctx.context._show_shipping_widget = True
@@ -380,7 +388,7 @@ async def tool_get_shipping_options(ctx: RunContextWrapper["RetailContext"]) ->
 @function_tool(description_override="Get available discount offers to retain a customer who changed their mind.")
 async def tool_get_retention_offers(ctx: RunContextWrapper["RetailContext"], customer_id: str) -> str:
     """Get retention offers."""
-    result = get_retention_offers(customer_id)
+    result = await asyncio.to_thread(get_retention_offers, customer_id)
     offers = result.get("offers", []) if isinstance(result, dict) else []
     if offers:
         ctx.context._show_retention_widget = True
@@ -410,7 +418,8 @@ async def tool_create_return_request(
         "quantity": quantity,
         "unit_price": unit_price,
     }]
-    result = create_return_request(
+    result = await asyncio.to_thread(
+        create_return_request,
         customer_id=customer_id,
         order_id=order_id,
         items=items,
@@ -430,7 +439,7 @@ async def tool_create_return_request(
 @function_tool(description_override="Get the return history for a customer.")
 async def tool_get_customer_return_history(ctx: RunContextWrapper["RetailContext"], customer_id: str) -> str:
     """Get customer return history."""
-    result = get_customer_return_history(customer_id)
+    result = await asyncio.to_thread(get_customer_return_history, customer_id)
     if result:
         return f"This customer has {len(result)} previous returns."
     return "No previous return history for this customer."
@@ -460,39 +469,39 @@ async def tool_get_session_context(ctx: RunContextWrapper["RetailContext"]) -> s
     Get the current session context to understand what was previously shown to the user.
     This helps when users refer to items/orders without specifying details.
     """
-    session = getattr(ctx.context, '_session_context', {})
+    session = getattr(ctx.context, '_session_context', None)
     
-    if not session:
+    if session is None:
         return "No session context available. The customer hasn't been identified yet or no items have been shown."
     
     context_parts = []
     
     # Customer info
-    if session.get("customer_id"):
-        context_parts.append(f"Customer: {session.get('customer_name', 'Unknown')} (ID: {session.get('customer_id')})")
+    if session.customer_id:
+        context_parts.append(f"Customer: {session.customer_name or 'Unknown'} (ID: {session.customer_id})")
     
     # Displayed orders with items
-    if session.get("displayed_orders"):
+    if session.displayed_orders:
         context_parts.append("\nItems shown to customer (available for return):")
-        for order in session.get("displayed_orders", []):
+        for order in session.displayed_orders:
             order_id = order.get("order_id", "Unknown")
             context_parts.append(f"  Order {order_id}:")
             for item in order.get("items", []):
                 context_parts.append(f"    - {item.get('name', 'Unknown')} (Product ID: {item.get('product_id')}, Price: ${item.get('unit_price', 0):.2f}, Qty: {item.get('quantity', 1)})")
     
     # Current selections
-    if session.get("selected_items"):
+    if session.selected_items:
         context_parts.append("\nItems selected for return:")
-        for item in session.get("selected_items", []):
+        for item in session.selected_items:
             context_parts.append(f"  - {item.get('name', 'Unknown')} from order {item.get('order_id', 'Unknown')}")
     
     # Return flow state
-    if session.get("reason_code"):
-        context_parts.append(f"\nReturn reason: {session.get('reason_code')}")
-    if session.get("resolution"):
-        context_parts.append(f"Resolution: {session.get('resolution')}")
-    if session.get("shipping_method"):
-        context_parts.append(f"Shipping: {session.get('shipping_method')}")
+    if session.reason_code:
+        context_parts.append(f"\nReturn reason: {session.reason_code}")
+    if session.resolution:
+        context_parts.append(f"Resolution: {session.resolution}")
+    if session.shipping_method:
+        context_parts.append(f"Shipping: {session.shipping_method}")
     
     if context_parts:
         return "\n".join(context_parts)
@@ -518,26 +527,26 @@ async def tool_set_user_selection(
     Returns:
         Confirmation message and instructions for next step
     """
-    session = getattr(ctx.context, '_session_context', {})
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
     
     if selection_type == "reason":
-        session["reason_code"] = selection_code
-        session["reason_label"] = selection_label or selection_code.replace("_", " ").title()
+        session.reason_code = selection_code
+        session.reason_label = selection_label or selection_code.replace("_", " ").title()
         ctx.context._session_context = session
-        return f"Recorded return reason: {session['reason_label']}. Now show resolution options with get_resolution_options."
+        return f"Recorded return reason: {session.reason_label}. Now show resolution options with get_resolution_options."
     
     elif selection_type == "resolution":
-        session["resolution"] = selection_code
-        session["resolution_label"] = selection_label or selection_code.replace("_", " ").title()
+        session.resolution = selection_code
+        session.resolution_label = selection_label or selection_code.replace("_", " ").title()
         ctx.context._session_context = session
-        return f"Recorded resolution: {session['resolution_label']}. Now show shipping options with get_shipping_options."
+        return f"Recorded resolution: {session.resolution_label}. Now show shipping options with get_shipping_options."
     
     elif selection_type == "shipping":
-        session["shipping_method"] = selection_code
-        session["shipping_label"] = selection_label or selection_code.replace("_", " ").title()
+        session.shipping_method = selection_code
+        session.shipping_label = selection_label or selection_code.replace("_", " ").title()
         ctx.context._session_context = session
         # All selections complete - instruct to finalize
-        return f"Recorded shipping method: {session['shipping_label']}. All selections complete! Now call finalize_return_from_session to create the return."
+        return f"Recorded shipping method: {session.shipping_label}. All selections complete! Now call finalize_return_from_session to create the return."
     
     else:
         return f"Unknown selection type: {selection_type}. Use 'reason', 'resolution', or 'shipping'."
@@ -549,31 +558,31 @@ async def tool_finalize_return_from_session(ctx: RunContextWrapper["RetailContex
     Finalize and create the return request using session data.
     This should be called after the user has made all selections (item, reason, resolution, shipping).
     """
-    session = getattr(ctx.context, '_session_context', {})
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
     
     # Check if return was already completed in this session
-    if session.get("return_completed"):
-        last_return_id = session.get("last_return_id", "unknown")
+    if session.return_completed:
+        last_return_id = session.last_return_id or "unknown"
         return f"A return has already been completed in this session (Return ID: {last_return_id}). If you need to start a new return, please say 'start a new return'."
     
     # Validate we have all required data
-    customer_id = session.get("customer_id")
+    customer_id = session.customer_id
     if not customer_id:
         return "Error: No customer identified in session. Please look up the customer first."
     
-    selected_items = session.get("selected_items", [])
+    selected_items = session.selected_items
     if not selected_items:
         return "Error: No items selected for return. Please select items first."
     
-    reason_code = session.get("reason_code")
+    reason_code = session.reason_code
     if not reason_code:
         return "Error: No return reason selected. Please select a reason first."
     
-    resolution = session.get("resolution")
+    resolution = session.resolution
     if not resolution:
         return "Error: No resolution selected. Please select a resolution first."
     
-    shipping_method = session.get("shipping_method", "PREPAID_LABEL")
+    shipping_method = session.shipping_method or "PREPAID_LABEL"
     
     # Get the first selected item (for single item returns)
     item = selected_items[0]
@@ -588,13 +597,14 @@ async def tool_finalize_return_from_session(ctx: RunContextWrapper["RetailContex
     } for item in selected_items]
     
     # Create the return
-    result = create_return_request(
+    result = await asyncio.to_thread(
+        create_return_request,
         customer_id=customer_id,
         order_id=order_id,
         items=items,
         reason_code=reason_code,
         resolution=resolution,
-        reason_details=session.get("reason_details", ""),
+        reason_details=session.reason_details,
         shipping_method=shipping_method,
     )
     
@@ -602,12 +612,9 @@ async def tool_finalize_return_from_session(ctx: RunContextWrapper["RetailContex
         ctx.context._show_confirmation_widget = True
         ctx.context._confirmation_data = result
         # Mark return as completed and clear selections for potential next return
-        session["return_completed"] = True
-        session["last_return_id"] = result.get("id")
-        session["reason_code"] = None
-        session["resolution"] = None
-        session["shipping_method"] = None
-        session["selected_items"] = []
+        session.return_completed = True
+        session.last_return_id = result.get("id")
+        session.clear_selections()
         ctx.context._session_context = session
         return f"Return request {result['id']} has been created successfully! Status: {result.get('status', 'pending')}. A prepaid shipping label will be emailed to the customer."
     
@@ -620,18 +627,15 @@ async def tool_start_new_return(ctx: RunContextWrapper["RetailContext"]) -> str:
     Reset the session state to allow the user to start a new return.
     This clears the return_completed flag and other selection data.
     """
-    session = getattr(ctx.context, '_session_context', {})
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
     
     # Clear return-related state but keep customer info
-    session["return_completed"] = False
-    session["last_return_id"] = None
-    session["reason_code"] = None
-    session["resolution"] = None
-    session["shipping_method"] = None
-    session["selected_items"] = []
-    session["selected_order_id"] = None
-    session["selected_item_name"] = None
-    session["displayed_orders"] = []
+    session.return_completed = False
+    session.last_return_id = None
+    session.clear_selections()
+    session.selected_order_id = None
+    session.selected_item_name = None
+    session.displayed_orders = ()
     
     ctx.context._session_context = session
     
@@ -650,8 +654,8 @@ async def tool_return_multiple_items(
     of what items the customer wants to return (e.g., "all items" or "both the shirt and pants").
     """
     # Get the session context to find the actual items
-    session = getattr(ctx.context, '_session_context', {})
-    displayed_orders = session.get("displayed_orders", [])
+    session = getattr(ctx.context, '_session_context', None) or ReturnSessionContext()
+    displayed_orders = session.displayed_orders
     
     # Find the order
     target_order = None
@@ -663,7 +667,7 @@ async def tool_return_multiple_items(
     if not target_order:
         # Try to fetch from database
         from .tools import get_returnable_items
-        result = get_returnable_items(customer_id)
+        result = await asyncio.to_thread(get_returnable_items, customer_id)
         if result.get("found"):
             for order in result.get("orders", []):
                 if order.get("order_id") == order_id:
@@ -678,7 +682,7 @@ async def tool_return_multiple_items(
         return f"No returnable items found in order {order_id}."
     
     # Store all items as selected
-    session["selected_items"] = [
+    session.selected_items = [
         {
             "order_id": order_id,
             "product_id": item.get("product_id"),
@@ -697,7 +701,7 @@ async def tool_return_multiple_items(
     # Trigger reasons widget
     ctx.context._show_reasons_widget = True
     from .tools import get_return_reasons
-    result = get_return_reasons()
+    result = await asyncio.to_thread(get_return_reasons)
     ctx.context._reasons_data = result.get("reasons", [])
     
     return f"I've noted that you want to return {len(items)} items from order {order_id}: {item_list}. Total value: ${total_value:.2f}. Now, please tell me why you're returning these items."
@@ -768,6 +772,31 @@ def create_retail_agent() -> Agent:
 # WIDGET BUILDING
 # =============================================================================
 
+# Option icons by reference-data code, resolved once per option set (the
+# option widgets are cached by get_option_widget)
+REASON_ICONS = {
+    "DEFECTIVE": "🔧",
+    "DAMAGED": "📦",
+    "WRONG_ITEM": "❌",
+    "WRONG_SIZE": "📏",
+    "NOT_AS_DESCRIBED": "📝",
+    "CHANGED_MIND": "💭",
+    "OTHER": "❓",
+}
+
+RESOLUTION_ICONS = {
+    "refund": "💰",
+    "exchange": "🔄",
+    "store_credit": "🎁",
+}
+
+SHIPPING_ICONS = {
+    "prepaid_label": "📬",
+    "drop_off": "🏪",
+    "pickup": "🚚",
+}
+
+
 def build_customer_widget(customer: dict) -> Card:
     """Build a customer profile card widget."""
     tier = customer.get("tier", "Standard")
@@ -861,16 +890,6 @@ def build_returnable_items_widget(orders: list, thread_id: str, customer_id: str
 
 def build_reasons_widget(reasons: list, thread_id: str) -> Card:
     """Build a widget for selecting return reason."""
-    icons = {
-        "DEFECTIVE": "🔧",
-        "DAMAGED": "📦",
-        "WRONG_ITEM": "❌",
-        "WRONG_SIZE": "📏",
-        "NOT_AS_DESCRIBED": "📝",
-        "CHANGED_MIND": "💭",
-        "OTHER": "❓",
-    }
-    
     children = [
         Title(id="reasons-title", value="❓ Why are you returning?", size="lg"),
         Divider(id="div1"),
@@ -879,7 +898,7 @@ def build_reasons_widget(reasons: list, thread_id: str) -> Card:
     for reason in reasons:
         code = reason.get("code", "")
         label = reason.get("label", code)
-        icon = icons.get(code, "📋")
+        icon = REASON_ICONS.get(code, "📋")
         
         children.append(
             Button(
@@ -900,12 +919,6 @@ def build_reasons_widget(reasons: list, thread_id: str) -> Card:
 
 def build_resolution_widget(options: list, thread_id: str) -> Card:
     """Build a widget for selecting resolution."""
-    icons = {
-        "refund": "💰",
-        "exchange": "🔄",
-        "store_credit": "🎁",
-    }
-    
     children = [
         Title(id="resolution-title", value="💳 How would you like to be compensated?", size="lg"),
         Divider(id="div1"),
@@ -915,7 +928,7 @@ def build_resolution_widget(options: list, thread_id: str) -> Card:
         code = opt.get("code", "")
         label = opt.get("label", code)
         desc = opt.get("description", "")
-        icon = icons.get(code, "✓")
+        icon = RESOLUTION_ICONS.get(code, "✓")
         
         children.append(
             Row(
@@ -949,12 +962,6 @@ def build_resolution_widget(options: list, thread_id: str) -> Card:
 
 def build_shipping_widget(options: list, thread_id: str) -> Card:
     """Build a widget for selecting shipping method."""
-    icons = {
-        "prepaid_label": "📬",
-        "drop_off": "🏪",
-        "pickup": "🚚",
-    }
-    
     children = [
         Title(id="shipping-title", value="📦 How will you return the item?", size="lg"),
         Divider(id="div1"),
@@ -964,7 +971,7 @@ def build_shipping_widget(options: list, thread_id: str) -> Card:
         code = opt.get("code", "")
         label = opt.get("label", code)
         cost = opt.get("cost", 0)
-        icon = icons.get(code, "📦")
+        icon = SHIPPING_ICONS.get(code, "📦")
         cost_text = "Free" if cost == 0 else f"${cost:.2f}"
         
         children.append(
@@ -997,6 +1004,40 @@ def build_shipping_widget(options: list, thread_id: str) -> Card:
     return Card(id=f"shipping-{thread_id}", children=children)
 
 
+# Option-list widgets (reasons, resolutions, shipping) are built from static
+# reference data, so each distinct option set is built once and re-stamped
+# with the thread-specific card id on every use.
+_option_widget_templates: dict[tuple, Card] = {}
+
+
+def get_option_widget(builder, options: list, thread_id: str) -> Card:
+    """
+    Return an option-list widget for a thread, reusing a cached widget tree.
+    
+    Args:
+        builder: One of build_reasons_widget, build_resolution_widget, build_shipping_widget
+        options: The option dicts to render
+        thread_id: Thread the widget is streamed to (used in the card id)
+    """
+    key = (builder, tuple(tuple(sorted(opt.items())) for opt in options))
+    template = _option_widget_templates.get(key)
+    if template is None:
+        template = _option_widget_templates[key] = builder(options, "")
+    # Shallow copy: children are shared but never mutated after build
+    return template.model_copy(update={"id": f"{template.id}{thread_id}"})
+
+
+def build_submitting_widget(thread_id: str) -> Card:
+    """Build a placeholder widget shown while the return is being created."""
+    return Card(
+        id=f"submitting-{thread_id}",
+        children=[
+            Title(id="submitting-title", value="⏳ Submitting your return...", size="lg"),
+            Text(id="submitting-text", value="This will only take a moment."),
+        ]
+    )
+
+
 def build_confirmation_widget(confirmation: dict, thread_id: str) -> Card:
     """Build a return confirmation widget."""
     return Card(
@@ -1021,10 +1062,48 @@ def build_confirmation_widget(confirmation: dict, thread_id: str) -> Card:
     )
 
 
+# Sequential-flow widgets for post_respond_hook, in priority order:
+# (name, context flag, context data attribute, builder(data, thread_id)).
+# Only the first flagged widget with data is shown per turn.
+FLOW_WIDGETS = (
+    ("reasons", "_show_reasons_widget", "_reasons_data", partial(get_option_widget, build_reasons_widget)),
+    ("resolution", "_show_resolution_widget", "_resolution_data", partial(get_option_widget, build_resolution_widget)),
+    ("shipping", "_show_shipping_widget", "_shipping_data", partial(get_option_widget, build_shipping_widget)),
+    ("confirmation", "_show_confirmation_widget", "_confirmation_data", build_confirmation_widget),
+)
+
+
+# Option widget shown after each selection action:
+# action type -> (option fetcher, result key, widget builder)
+NEXT_OPTION_WIDGETS = {
+    "select_return_item": (get_return_reasons, "reasons", build_reasons_widget),
+    "select_reason": (get_resolution_options, "options", build_resolution_widget),
+    "select_resolution": (get_shipping_options, "options", build_shipping_widget),
+}
+
+# User-message text for each widget action, formatted only for the action taken
+ACTION_MESSAGES = {
+    "select_customer": lambda p: f"I am customer {p.get('customer_id', '')}",
+    "select_return_item": lambda p: f"I want to return {p.get('name', 'this item')} from order {p.get('order_id', '')}",
+    "select_reason": lambda p: f"The reason for my return is: {p.get('reason_code', '')}",
+    "select_resolution": lambda p: f"I would like a {p.get('resolution', 'refund')}",
+    "select_shipping": lambda p: f"I will use {p.get('shipping_method', 'prepaid_label').replace('_', ' ')}",
+    "accept_offer": lambda p: "I'll accept the discount offer and keep the item",
+    "decline_offers": lambda p: "No thanks, I want to continue with the return",
+    "confirm_return": lambda p: "Yes, please confirm and process my return",
+    "cancel_return": lambda p: "I want to cancel this return request",
+}
+
+
 # =============================================================================
 # SERVER IMPLEMENTATION
 # =============================================================================
 
+# Per-thread session contexts kept in memory; the least recently used thread
+# is dropped past this many
+MAX_THREAD_SESSIONS = 1000
+
+
 class RetailChatKitServer(BaseChatKitServer):
     """
     ChatKit server for retail order returns.
@@ -1045,19 +1124,29 @@ class RetailChatKitServer(BaseChatKitServer):
         """
         super().__init__(data_store)
         self._agent = None
-        # Per-thread session contexts: thread_id -> context dict
-        # This ensures concurrent users don't share state
-        self._thread_sessions: dict[str, dict] = {}
-    
-    def _get_session_context(self, thread_id: str) -> dict:
+        # Per-thread session contexts: thread_id -> ReturnSessionContext
+        # This ensures concurrent users don't share state. Kept in least- to
+        # most-recently-used order and capped at MAX_THREAD_SESSIONS
+        self._thread_sessions: OrderedDict[str, ReturnSessionContext] = OrderedDict()
+        # Detached work that must outlive a disconnected request
+        self._background_tasks: set[asyncio.Task] = set()
+    
+    def _get_session_context(self, thread_id: str) -> ReturnSessionContext:
         """Get or create session context for a specific thread."""
-        if thread_id not in self._thread_sessions:
-            self._thread_sessions[thread_id] = {}
-        return self._thread_sessions[thread_id]
+        session = self._thread_sessions.get(thread_id)
+        if session is None:
+            session = ReturnSessionContext()
+            self._set_session_context(thread_id, session)
+        else:
+            self._thread_sessions.move_to_end(thread_id)
+        return session
     
-    def _clear_session_context(self, thread_id: str) -> None:
-        """Clear session context for a thread (e.g., when thread is deleted)."""
-        self._thread_sessions.pop(thread_id, None)
+    def _set_session_context(self, thread_id: str, session: ReturnSessionContext) -> None:
+        """Store a thread's session context, evicting the least recently used past the cap."""
+        self._thread_sessions[thread_id] = session
+        self._thread_sessions.move_to_end(thread_id)
+        while len(self._thread_sessions) > MAX_THREAD_SESSIONS:
+            self._thread_sessions.popitem(last=False)
     
     def get_agent(self) -> Agent:
         """Return the retail returns agent."""
@@ -1111,54 +1200,7 @@ class RetailChatKitServer(BaseChatKitServer):
         Args:
             thread_id: The thread ID to get session context for
         """
-        session = self._get_session_context(thread_id)
-        if not session:
-            return ""
-        
-        parts = []
-        
-        # Customer info
-        if session.get("customer_id"):
-            parts.append(f"Current customer: {session.get('customer_name', 'Unknown')} (ID: {session.get('customer_id')})")
-        
-        # Displayed orders with items that can be returned
-        if session.get("displayed_orders"):
-            parts.append("\nItems displayed for potential return:")
-            for order in session.get("displayed_orders", []):
-                order_id = order.get("order_id", "Unknown")
-                parts.append(f"  Order {order_id}:")
-                for item in order.get("items", []):
-                    parts.append(f"    - {item.get('name', 'Unknown')} (Product: {item.get('product_id')}, ${item.get('unit_price', 0):.2f}, Qty: {item.get('quantity', 1)})")
-        
-        # Currently selected items for return - CHECK BOTH formats
-        if session.get("selected_items"):
-            parts.append("\n✅ ITEM ALREADY SELECTED - DO NOT ASK AGAIN:")
-            for item in session.get("selected_items", []):
-                parts.append(f"  - {item.get('name', 'Unknown')} from order {item.get('order_id')}")
-        elif session.get("selected_order_id") and session.get("selected_item_name"):
-            parts.append(f"\n✅ ITEM ALREADY SELECTED - DO NOT ASK AGAIN: {session.get('selected_item_name')} from order {session.get('selected_order_id')}")
-        
-        # Return flow progress - explicit about what's done
-        progress = []
-        if session.get("reason_code"):
-            progress.append(f"✅ Return reason: {session.get('reason_code')} (ALREADY SELECTED - DO NOT ASK AGAIN)")
-        if session.get("resolution"):
-            progress.append(f"✅ Resolution: {session.get('resolution')} (ALREADY SELECTED - DO NOT ASK AGAIN)")
-        if session.get("shipping_method"):
-            progress.append(f"✅ Shipping method: {session.get('shipping_method')} (ALREADY SELECTED - DO NOT ASK AGAIN)")
-        
-        if progress:
-            parts.append("\nRETURN FLOW PROGRESS:")
-            parts.extend(progress)
-        
-        # Check if a return was already completed in this session
-        if session.get("return_completed"):
-            last_return_id = session.get("last_return_id", "Unknown")
-            parts.append(f"\n🎉 RETURN ALREADY COMPLETED - Return ID: {last_return_id}")
-            parts.append("DO NOT try to finalize another return. Just respond conversationally.")
-            parts.append("If user wants another return, they should say 'start a new return'.")
-        
-        return "\n".join(parts) if parts else ""
+        return self._get_session_context(thread_id).to_context_string()
 
     async def respond(
         self,
@@ -1202,16 +1244,16 @@ class RetailChatKitServer(BaseChatKitServer):
         # AUTO-POPULATE: If user is authenticated, pre-fill their customer info
         if context and isinstance(context, dict) and context.get("user_email"):
             # Only set if not already identified in this thread
-            if not thread_session.get("customer_id"):
+            if not thread_session.customer_id:
                 # Look up the customer by email to get their customer_id
                 from .tools import lookup_customer
-                result = lookup_customer(context["user_email"])
+                result = await asyncio.to_thread(lookup_customer, context["user_email"])
                 if result.get("found") and not result.get("multiple"):
                     customer = result.get("customer", {})
-                    thread_session["customer_id"] = customer.get("id")
-                    thread_session["customer_name"] = customer.get("name", "")
-                    thread_session["customer_tier"] = customer.get("tier", "Standard")
-                    thread_session["customer_email"] = context["user_email"]
+                    thread_session.customer_id = customer.get("id")
+                    thread_session.customer_name = customer.get("name", "")
+                    thread_session.customer_tier = customer.get("tier", "Standard")
+                    thread_session.customer_email = context["user_email"]
                     logger.info(f"Auto-identified logged-in user: {customer.get('name')} ({context['user_email']})")
         
         agent_context._session_context = thread_session
@@ -1235,20 +1277,19 @@ class RetailChatKitServer(BaseChatKitServer):
         
         # PREPEND SESSION CONTEXT as a system message to give agent context
         # This helps the agent understand references like "items above" or "both items"
-        if thread_session:
-            context_summary = self._build_context_summary(thread.id)
-            if context_summary:
-                # Prepend context as a system-like message that the agent can reference
-                context_message = f"[CURRENT SESSION STATE]\n{context_summary}\n[END SESSION STATE]"
-                agent_input = [{"role": "system", "content": context_message}] + agent_input
-                logger.info(f"Injected session context for thread {thread.id} into agent input")
+        context_summary = self._build_context_summary(thread.id)
+        if context_summary:
+            # Prepend context as a system-like message that the agent can reference
+            context_message = f"[CURRENT SESSION STATE]\n{context_summary}\n[END SESSION STATE]"
+            agent_input = [{"role": "system", "content": context_message}] + agent_input
+            logger.info(f"Injected session context for thread {thread.id} into agent input")
         logger.info(f"Agent input includes {len(relevant_items)} messages from conversation history")
         
         # Get the agent
         agent = self.get_agent()
         
         # Create workflow status hooks for ChatGPT-style progress indicators
-        from workflow_status import create_tool_status_hooks, wrap_for_hosted_tools
+        from workflow_status import create_tool_status_hooks, tool_status_tracking, wrap_for_hosted_tools
         from use_cases.retail.tool_status import RETAIL_TOOL_STATUS_MESSAGES
         
         hooks, tracker = create_tool_status_hooks(
@@ -1260,13 +1301,14 @@ class RetailChatKitServer(BaseChatKitServer):
         # This avoids showing "Working on it..." for simple responses with no tools
         
         # Run the agent with streaming and status hooks
-        result = Runner.run_streamed(
-            agent,
-            agent_input,
-            context=agent_context,
-            hooks=hooks,
-            run_config=RunConfig(model=azure_model),
-        )
+        with tool_status_tracking(tracker):
+            result = Runner.run_streamed(
+                agent,
+                agent_input,
+                context=agent_context,
+                hooks=hooks,
+                run_config=RunConfig(model=azure_model),
+            )
         
         # Wrap result to detect hosted tool events (file_search, web_search)
         # This enables shimmer progress indicators for these server-side tools
@@ -1279,9 +1321,9 @@ class RetailChatKitServer(BaseChatKitServer):
         # End the workflow if it was started
         await tracker.end_workflow_if_started()
         
-        # SYNC SESSION CONTEXT BACK: Update thread's session from agent context
+        # SYNC SESSION CONTEXT BACK: Tools may have replaced the session object
         if hasattr(agent_context, '_session_context'):
-            thread_session.update(agent_context._session_context)
+            self._set_session_context(thread.id, agent_context._session_context)
         
         # Call the post-respond hook for widget streaming
         async for event in self.post_respond_hook(thread, agent_context):
@@ -1300,39 +1342,34 @@ class RetailChatKitServer(BaseChatKitServer):
         # Get per-thread session context
         session = self._get_session_context(thread.id)
         
-        # Action is a Pydantic model with .type and .payload attributes
-        action_type = getattr(action, 'type', '') if action else ''
+        # One clock read for everything emitted by this action. Threads reload
+        # sorted by created_at alone, so each item emitted after the user
+        # message is stamped a microsecond later
+        now = datetime.now(timezone.utc)
+        widget_created_at = now + timedelta(microseconds=1)
+        
+        # Action is a Pydantic model with .type and .payload attributes.
+        # Intern the type so dict dispatch and the == chain below hit the
+        # identity fast path against the (already interned) literal keys.
+        action_type = sys.intern(getattr(action, 'type', '') if action else '')
         payload = getattr(action, 'payload', {}) or {}
         
         logger.info(f"Handling retail action: {action_type}, payload: {payload}")
         
-        # Convert action to user message for the agent
-        action_messages = {
-            "select_customer": f"I am customer {payload.get('customer_id', '')}",
-            "select_return_item": f"I want to return {payload.get('name', 'this item')} from order {payload.get('order_id', '')}",
-            "select_reason": f"The reason for my return is: {payload.get('reason_code', '')}",
-            "select_resolution": f"I would like a {payload.get('resolution', 'refund')}",
-            "select_shipping": f"I will use {payload.get('shipping_method', 'prepaid_label').replace('_', ' ')}",
-            "accept_offer": "I'll accept the discount offer and keep the item",
-            "decline_offers": "No thanks, I want to continue with the return",
-            "confirm_return": "Yes, please confirm and process my return",
-            "cancel_return": "I want to cancel this return request",
-        }
-        
         # Store context from action
         if action_type == "select_customer":
-            session["customer_id"] = payload.get("customer_id")
-            session["customer_name"] = payload.get("name", "")
+            session.customer_id = payload.get("customer_id")
+            session.customer_name = payload.get("name", "")
         
         elif action_type == "select_return_item":
-            session["customer_id"] = payload.get("customer_id", "")
-            session["selected_order_id"] = payload.get("order_id")
-            session["selected_product_id"] = payload.get("product_id")
-            session["selected_item_name"] = payload.get("name")
-            session["unit_price"] = payload.get("unit_price", 0)
-            session["quantity"] = payload.get("quantity", 1)
+            session.customer_id = payload.get("customer_id", "")
+            session.selected_order_id = payload.get("order_id")
+            session.selected_product_id = payload.get("product_id")
+            session.selected_item_name = payload.get("name")
+            session.unit_price = payload.get("unit_price", 0)
+            session.quantity = payload.get("quantity", 1)
             # Also store in selected_items list for finalize_return_from_session
-            session["selected_items"] = [{
+            session.selected_items = [{
                 "customer_id": payload.get("customer_id", ""),
                 "order_id": payload.get("order_id"),
                 "product_id": payload.get("product_id"),
@@ -1342,117 +1379,149 @@ class RetailChatKitServer(BaseChatKitServer):
             }]
         
         elif action_type == "select_reason":
-            session["reason_code"] = payload.get("reason_code")
-            session["reason_details"] = payload.get("reason_details", "")
+            session.reason_code = payload.get("reason_code")
+            session.reason_details = payload.get("reason_details", "")
         
         elif action_type == "select_resolution":
-            session["resolution"] = payload.get("resolution")
+            session.resolution = payload.get("resolution")
         
         elif action_type == "select_shipping":
-            session["shipping_method"] = payload.get("shipping_method")
+            session.shipping_method = payload.get("shipping_method")
+        
+        elif action_type == "cancel_return":
+            # Drop the abandoned return's selections but keep who the
+            # customer is, so a follow-up ("return something else") still works
+            session.clear_selections()
+            session.selected_order_id = None
+            session.selected_item_name = None
         
         # Generate a text response acknowledging the action
-        message_text = action_messages.get(action_type, f"You selected: {action_type}")
+        format_message = ACTION_MESSAGES.get(action_type)
+        message_text = format_message(payload) if format_message else f"You selected: {action_type}"
         
         logger.info(f"Action processed: {message_text}")
         
         # Emit a user message to show the selection in the thread
         # This makes the user's choices visible in the conversation
         user_message_item = UserMessageItem(
-            id=f"user-selection-{uuid.uuid4().hex[:8]}",
+            id=self.store.generate_item_id("message", thread, context),
             thread_id=thread.id,
-            created_at=datetime.now(timezone.utc),
+            created_at=now,
             content=[UserMessageTextContent(type="input_text", text=message_text)],
             attachments=[],
             inference_options=InferenceOptions(),
         )
-        yield ThreadItemDoneEvent(item=user_message_item)
         
-        # Stream the next appropriate widget based on action type
-        if action_type == "select_return_item":
-            # After selecting item, show reasons widget
-            result = get_return_reasons()
-            reasons = result.get("reasons", []) if isinstance(result, dict) else []
-            if reasons:
-                widget = build_reasons_widget(reasons, thread.id)
-                async for event in stream_widget(thread, widget):
-                    yield event
-        
-        elif action_type == "select_reason":
-            # After selecting reason, show resolution options
-            result = get_resolution_options()
-            options = result.get("options", []) if isinstance(result, dict) else []
+        # Collect everything that can be produced without waiting on a Cosmos
+        # write and emit it back-to-back, rather than interleaving yields with
+        # nested stream_widget generators
+        events = [ThreadItemDoneEvent(item=user_message_item)]
+        create_task = None
+        
+        # Show the next appropriate widget based on action type
+        next_step = NEXT_OPTION_WIDGETS.get(action_type)
+        if next_step:
+            fetch_options, options_key, builder = next_step
+            result = await asyncio.to_thread(fetch_options)
+            options = result.get(options_key, []) if isinstance(result, dict) else []
             if options:
-                widget = build_resolution_widget(options, thread.id)
-                async for event in stream_widget(thread, widget):
-                    yield event
-        
-        elif action_type == "select_resolution":
-            # After selecting resolution, show shipping options
-            result = get_shipping_options()
-            shipping = result.get("options", []) if isinstance(result, dict) else []
-            if shipping:
-                widget = build_shipping_widget(shipping, thread.id)
-                async for event in stream_widget(thread, widget):
-                    yield event
+                events.append(ThreadItemDoneEvent(
+                    item=WidgetItem(
+                        id=self.store.generate_item_id("message", thread, context),
+                        thread_id=thread.id,
+                        created_at=widget_created_at,
+                        widget=get_option_widget(builder, options, thread.id),
+                    )
+                ))
         
         elif action_type == "select_shipping":
-            # After selecting shipping, actually create the return in Cosmos DB
-            try:
-                # Gather all context for the return (from per-thread session)
-                customer_id = session.get("customer_id", "")
-                order_id = session.get("selected_order_id", "")
-                product_id = session.get("selected_product_id", "")
-                item_name = session.get("selected_item_name", "")
-                unit_price = session.get("unit_price", 0)
-                quantity = session.get("quantity", 1)
-                reason_code = session.get("reason_code", "OTHER")
-                reason_details = session.get("reason_details", "")
-                resolution = session.get("resolution", "refund")
-                shipping_method = session.get("shipping_method", "prepaid_label")
-                
-                # Build items list for the return
-                items = [{
-                    "product_id": product_id,
-                    "name": item_name,
-                    "quantity": quantity,
-                    "unit_price": unit_price,
-                }]
+            # After selecting shipping, actually create the return in Cosmos DB.
+            # Start the write first, then acknowledge immediately so the UI
+            # doesn't stall for the Cosmos round-trip.
+            fallback_return_id = f"RET-{now.strftime('%Y%m%d%H%M%S')}"
+            create_kwargs = session.build_create_request_kwargs()
+            confirmation_item_id = self.store.generate_item_id("message", thread, context)
+            
+            async def submit_return() -> WidgetItem:
+                """
+                Create the return, record it in the session and build the
+                confirmation item. Runs to completion even if the client
+                disconnects, so the session always knows about the return.
+                """
+                try:
+                    result = await asyncio.to_thread(create_return_request, **create_kwargs)
+                    
+                    logger.info(f"Return created successfully: {result}")
+                    
+                    # Mark return as completed so agent doesn't try to finalize again
+                    session.return_completed = True
+                    session.last_return_id = result.get("return_id", "")
+                    
+                    confirmation = {
+                        "id": result.get("return_id", fallback_return_id),
+                        "status": result.get("status", "pending"),
+                        "refund_amount": result.get("refund_amount", 0),
+                    }
+                except Exception as e:
+                    logger.error(f"Error creating return: {e}")
+                    # Fallback to display-only confirmation if save fails
+                    confirmation = {
+                        "id": fallback_return_id,
+                        "status": "pending",
+                        "error": str(e),
+                    }
                 
-                # Create the return request in Cosmos DB
-                result = create_return_request(
-                    customer_id=customer_id,
-                    order_id=order_id,
-                    items=items,
-                    reason_code=reason_code,
-                    reason_details=reason_details,
-                    resolution=resolution,
-                    shipping_method=shipping_method,
+                return WidgetItem(
+                    id=confirmation_item_id,
+                    thread_id=thread.id,
+                    created_at=widget_created_at,
+                    widget=build_confirmation_widget(confirmation, thread.id),
                 )
-                
-                logger.info(f"Return created successfully: {result}")
-                
-                # Mark return as completed so agent doesn't try to finalize again
-                session["return_completed"] = True
-                session["last_return_id"] = result.get("return_id", "")
-                
-                confirmation = {
-                    "id": result.get("return_id", f"RET-{datetime.now().strftime('%Y%m%d%H%M%S')}"),
-                    "status": result.get("status", "pending"),
-                    "refund_amount": result.get("refund_amount", 0),
-                }
-            except Exception as e:
-                logger.error(f"Error creating return: {e}")
-                # Fallback to display-only confirmation if save fails
-                confirmation = {
-                    "id": f"RET-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                    "status": "pending",
-                    "error": str(e),
-                }
             
-            widget = build_confirmation_widget(confirmation, thread.id)
-            async for event in stream_widget(thread, widget):
+            create_task = asyncio.create_task(submit_return())
+            
+            events.append(ThreadItemDoneEvent(
+                item=WidgetItem(
+                    id=confirmation_item_id,
+                    thread_id=thread.id,
+                    created_at=widget_created_at,
+                    widget=build_submitting_widget(thread.id),
+                )
+            ))
+        
+        confirmation_delivered = False
+        try:
+            for event in events:
                 yield event
+            
+            if create_task is not None:
+                # Shield the write so a client disconnect can't abort a half-submitted return
+                confirmation_item = await asyncio.shield(create_task)
+                
+                # Swap the "submitting" placeholder for the final confirmation
+                yield ThreadItemReplacedEvent(item=confirmation_item)
+                confirmation_delivered = True
+        finally:
+            if create_task is not None and not confirmation_delivered:
+                # The client went away mid-submit: store the confirmation once
+                # the write finishes so the thread doesn't stay on "Submitting..."
+                self._run_in_background(
+                    self._save_item_when_done(create_task, thread.id, context)
+                )
+    
+    def _run_in_background(self, coro) -> None:
+        """Run a coroutine detached from the current request, keeping it referenced until done."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _save_item_when_done(self, task: asyncio.Task, thread_id: str, context: Any) -> None:
+        """Persist the thread item produced by a detached task."""
+        try:
+            item = await task
+            await self.store.save_item(thread_id, item, context=context)
+        except Exception as e:
+            logger.error(f"Error saving item for thread {thread_id}: {e}")
     
     async def post_respond_hook(
         self,
@@ -1490,7 +1559,7 @@ class RetailChatKitServer(BaseChatKitServer):
                 # ALSO store displayed orders in session context for natural language references
                 # Use per-thread session context for isolation
                 thread_session = self._get_session_context(thread_id)
-                thread_session["displayed_orders"] = [
+                thread_session.displayed_orders = [
                     {
                         "order_id": order.get("id"),
                         "order_date": order.get("order_date"),
@@ -1512,77 +1581,11 @@ class RetailChatKitServer(BaseChatKitServer):
                     yield event
         
         # Phase 2: Only ONE of these widgets at a time (sequential flow after item selection)
-        widget_shown = False
-        
-        # Reasons widget (shown after item selection)
-        if not widget_shown and getattr(agent_context, '_show_reasons_widget', False):
-            reasons_data = getattr(agent_context, '_reasons_data', [])
-            if reasons_data:
-                widget = build_reasons_widget(reasons_data, thread_id)
-                logger.info(f"Streaming reasons widget with {len(reasons_data)} options")
-                async for event in stream_widget(thread, widget):
-                    yield event
-                widget_shown = True
-        
-        # Resolution widget (shown after reason selection)
-        if not widget_shown and getattr(agent_context, '_show_resolution_widget', False):
-            resolution_data = getattr(agent_context, '_resolution_data', [])
-            if resolution_data:
-                widget = build_resolution_widget(resolution_data, thread_id)
-                logger.info(f"Streaming resolution widget with {len(resolution_data)} options")
-                async for event in stream_widget(thread, widget):
-                    yield event
-                widget_shown = True
-        
-        # Priority 5: Shipping widget (shown after resolution selection)
-        if not widget_shown and getattr(agent_context, '_show_shipping_widget', False):
-            shipping_data = getattr(agent_context, '_shipping_data', [])
-            if shipping_data:
-                widget = build_shipping_widget(shipping_data, thread_id)
-                logger.info(f"Streaming shipping widget with {len(shipping_data)} options")
-                async for event in stream_widget(thread, widget):
-                    yield event
-                widget_shown = True
-        
-        # Priority 6: Confirmation widget (final step - always show if flagged)
-        if not widget_shown and getattr(agent_context, '_show_confirmation_widget', False):
-            confirmation_data = getattr(agent_context, '_confirmation_data', {})
-            if confirmation_data:
-                widget = build_confirmation_widget(confirmation_data, thread_id)
-                logger.info(f"Streaming confirmation widget for return {confirmation_data.get('id')}")
-                async for event in stream_widget(thread, widget):
-                    yield event
-                widget_shown = True
-
-    async def _collapse_old_widgets(
-        self,
-        thread: ThreadMetadata,
-        context: Any,
-    ) -> AsyncIterator[ThreadStreamEvent]:
-        """
-        Replace old widgets with summaries to keep UI clean.
-        """
-        try:
-            items_page: Page = await self.data_store.load_thread_items(
-                thread_id=thread.id,
-            )
-            
-            for item in items_page.items:
-                if isinstance(item, WidgetItem):
-                    widget_data = item.widget.data if hasattr(item, "widget") else {}
-                    widget_type = widget_data.get("type", "")
-                    
-                    if widget_type in ["item_selector", "option_selector", "resolution_selector"]:
-                        # Replace with a text summary
-                        summary_text = f"[Previous selection widget - {widget_type}]"
-                        yield ThreadItemReplacedEvent(
-                            item=AssistantMessageItem(
-                                id=item.id,
-                                content=[AssistantMessageContent(
-                                    type="text",
-                                    text=summary_text,
-                                )],
-                            )
-                        )
-        except Exception as e:
-            logger.warning(f"Error collapsing old widgets: {e}")
+        for name, flag, data_attr, builder in FLOW_WIDGETS:
+            if getattr(agent_context, flag, False):
+                data = getattr(agent_context, data_attr, None)
+                if data:
+                    logger.info(f"Streaming {name} widget")
+                    async for event in stream_widget(thread, builder(data, thread_id)):
+                        yield event
+                    break
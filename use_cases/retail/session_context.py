@@ -0,0 +1,209 @@
+"""
+Session Context for the Retail Returns Flow.
+
+Holds the per-thread state shared by both input paths:
+- Widget actions (button clicks handled in RetailChatKitServer.action)
+- Natural language (agent tools such as set_user_selection)
+
+Both paths read and write the same ReturnSessionContext instance, so a
+selection made by clicking is visible when the user types, and vice versa.
+See docs/DUAL_INPUT_ARCHITECTURE.md for the full flow.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+class ReturnFlowStep(IntEnum):
+    """
+    Steps of the returns flow, in the order the user moves through them.
+
+    Integer-valued so steps compare cheaply and can be ordered
+    (e.g. ``step >= ReturnFlowStep.SELECT_REASON``).
+    """
+
+    IDENTIFY_CUSTOMER = 0
+    SELECT_ITEMS = 1
+    SELECT_REASON = 2
+    SELECT_RESOLUTION = 3
+    SELECT_SHIPPING = 4
+    READY_TO_CREATE = 5
+    COMPLETED = 6
+
+    @property
+    def label(self) -> str:
+        """Lowercase name for logs and serialized state (e.g. "select_reason")."""
+        return _STEP_LABELS[self]
+
+
+_STEP_LABELS = {step: step.name.lower() for step in ReturnFlowStep}
+
+
+@dataclass(slots=True)
+class ReturnSessionContext:
+    """
+    Typed session state for a single conversation thread.
+
+    Slots keep attribute access cheap and drop the per-instance __dict__,
+    since one instance lives for every active thread.
+    """
+
+    # Customer identity
+    customer_id: Optional[str] = None
+    customer_name: str = ""
+    customer_tier: str = "Standard"
+    customer_email: Optional[str] = None
+
+    # Orders/items shown to the user (for "the items above" references).
+    # List fields default to a shared empty tuple and are replaced (never
+    # appended to) when populated, so idle sessions allocate nothing.
+    displayed_orders: Sequence[Dict[str, Any]] = ()
+
+    # Item selection
+    selected_items: Sequence[Dict[str, Any]] = ()
+    selected_order_id: Optional[str] = None
+    selected_product_id: Optional[str] = None
+    selected_item_name: Optional[str] = None
+    unit_price: float = 0
+    quantity: int = 1
+
+    # Return flow selections
+    reason_code: Optional[str] = None
+    reason_label: str = ""
+    reason_details: str = ""
+    resolution: Optional[str] = None
+    resolution_label: str = ""
+    shipping_method: Optional[str] = None
+    shipping_label: str = ""
+
+    # Completion state
+    return_completed: bool = False
+    last_return_id: Optional[str] = None
+
+    @property
+    def flow_step(self) -> ReturnFlowStep:
+        """Derive the current step of the returns flow from the collected data."""
+        if self.return_completed:
+            return ReturnFlowStep.COMPLETED
+        if not self.customer_id:
+            return ReturnFlowStep.IDENTIFY_CUSTOMER
+        if not self.selected_items:
+            return ReturnFlowStep.SELECT_ITEMS
+        if not self.reason_code:
+            return ReturnFlowStep.SELECT_REASON
+        if not self.resolution:
+            return ReturnFlowStep.SELECT_RESOLUTION
+        if not self.shipping_method:
+            return ReturnFlowStep.SELECT_SHIPPING
+        return ReturnFlowStep.READY_TO_CREATE
+
+    def is_ready_to_create_return(self) -> bool:
+        """Check whether all selections needed to create a return are present."""
+        return self.flow_step is ReturnFlowStep.READY_TO_CREATE
+
+    def iter_displayed_items(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield every displayed item, tagged with its order id.
+
+        Each yielded dict is a fresh projection in the same shape as
+        selected_items entries, so callers can store it without copying.
+        """
+        for order in self.displayed_orders:
+            order_id = order.get("order_id") or order.get("id", "")
+            for item in order.get("items", ()):
+                yield {
+                    "order_id": order_id,
+                    "product_id": item.get("product_id"),
+                    "name": item.get("name"),
+                    "unit_price": item.get("unit_price", 0),
+                    "quantity": item.get("quantity", 1),
+                }
+
+    def get_all_displayed_items(self) -> List[Dict[str, Any]]:
+        """Return all displayed items across orders as a list."""
+        return list(self.iter_displayed_items())
+
+    def clear_selections(self) -> None:
+        """Clear item/reason/resolution/shipping selections, keeping customer info."""
+        self.reason_code = None
+        self.resolution = None
+        self.shipping_method = None
+        self.selected_items = ()
+
+    def build_create_request_kwargs(self) -> Dict[str, Any]:
+        """
+        Collect the single selected item and return choices as keyword
+        arguments for create_return_request.
+
+        Missing selections fall back to the same defaults the widget flow
+        has always used (OTHER / refund / prepaid_label).
+        """
+        return {
+            "customer_id": self.customer_id or "",
+            "order_id": self.selected_order_id or "",
+            "items": [{
+                "product_id": self.selected_product_id or "",
+                "name": self.selected_item_name or "",
+                "quantity": self.quantity,
+                "unit_price": self.unit_price,
+            }],
+            "reason_code": self.reason_code or "OTHER",
+            "reason_details": self.reason_details,
+            "resolution": self.resolution or "refund",
+            "shipping_method": self.shipping_method or "prepaid_label",
+        }
+
+    def to_context_string(self) -> str:
+        """
+        Build a summary of the session for the agent.
+
+        This is injected as a [CURRENT SESSION STATE] block so the agent
+        understands what was previously shown/selected.
+        """
+        parts = []
+
+        # Customer info
+        if self.customer_id:
+            parts.append(f"Current customer: {self.customer_name or 'Unknown'} (ID: {self.customer_id})")
+
+        # Displayed orders with items that can be returned
+        if self.displayed_orders:
+            parts.append("\nItems displayed for potential return:")
+            for order in self.displayed_orders:
+                parts.append(f"  Order {order.get('order_id', 'Unknown')}:")
+                parts.extend(
+                    f"    - {item.get('name', 'Unknown')} (Product: {item.get('product_id')}, ${item.get('unit_price', 0):.2f}, Qty: {item.get('quantity', 1)})"
+                    for item in order.get("items", ())
+                )
+
+        # Currently selected items for return - CHECK BOTH formats
+        if self.selected_items:
+            parts.append("\n✅ ITEM ALREADY SELECTED - DO NOT ASK AGAIN:")
+            parts.extend(
+                f"  - {item.get('name', 'Unknown')} from order {item.get('order_id')}"
+                for item in self.selected_items
+            )
+        elif self.selected_order_id and self.selected_item_name:
+            parts.append(f"\n✅ ITEM ALREADY SELECTED - DO NOT ASK AGAIN: {self.selected_item_name} from order {self.selected_order_id}")
+
+        # Return flow progress - explicit about what's done
+        progress = []
+        if self.reason_code:
+            progress.append(f"✅ Return reason: {self.reason_code} (ALREADY SELECTED - DO NOT ASK AGAIN)")
+        if self.resolution:
+            progress.append(f"✅ Resolution: {self.resolution} (ALREADY SELECTED - DO NOT ASK AGAIN)")
+        if self.shipping_method:
+            progress.append(f"✅ Shipping method: {self.shipping_method} (ALREADY SELECTED - DO NOT ASK AGAIN)")
+
+        if progress:
+            parts.append("\nRETURN FLOW PROGRESS:")
+            parts.extend(progress)
+
+        # Check if a return was already completed in this session
+        if self.return_completed:
+            parts.append(f"\n🎉 RETURN ALREADY COMPLETED - Return ID: {self.last_return_id or 'Unknown'}")
+            parts.append("DO NOT try to finalize another return. Just respond conversationally.")
+            parts.append("If user wants another return, they should say 'start a new return'.")
+
+        return "\n".join(parts)
@@ -2,11 +2,13 @@
 Retail-specific tool status messages for workflow indicators.
 
 This module defines user-friendly status messages for retail tools.
-Each tool maps to (start_message, end_message, icon) tuples.
+Each tool maps to a ToolStatus(start, end, icon) named tuple.
 """
 
 from typing import Dict
 
+from workflow_status import ToolStatus
+
 # Valid ChatKit icons reference:
 # 'agent', 'analytics', 'atom', 'batch', 'bolt', 'book-open', 'book-closed', 
 # 'book-clock', 'bug', 'calendar', 'chart', 'check', 'check-circle', 'check-circle-filled', 
@@ -16,96 +18,96 @@ from typing import Dict
 # 'reload', 'star', 'search', 'sparkle', 'sparkle-double', 'square-code', 'square-image', 
 # 'square-text', 'suitcase', 'settings-slider', 'user', 'wreath', 'write'
 
-RETAIL_TOOL_STATUS_MESSAGES: Dict[str, tuple] = {
+RETAIL_TOOL_STATUS_MESSAGES: Dict[str, ToolStatus] = {
     # Customer operations
-    "lookup_customer": (
+    "lookup_customer": ToolStatus(
         "Looking up customer...",
         "Customer found",
         "search",
     ),
     
     # Order operations
-    "get_customer_orders": (
+    "get_customer_orders": ToolStatus(
         "Fetching order history...",
         "Orders retrieved",
         "document",
     ),
-    "get_returnable_items": (
+    "get_returnable_items": ToolStatus(
         "Finding returnable items...",
         "Returnable items found",
         "cube",
     ),
     
     # Return flow operations
-    "check_return_eligibility": (
+    "check_return_eligibility": ToolStatus(
         "Checking return eligibility...",
         "Eligibility verified",
         "check-circle",
     ),
-    "get_return_reasons": (
+    "get_return_reasons": ToolStatus(
         "Loading return reasons...",
         "Ready for selection",
         "info",
     ),
-    "get_resolution_options": (
+    "get_resolution_options": ToolStatus(
         "Fetching resolution options...",
         "Options available",
         "lightbulb",
     ),
-    "get_shipping_options": (
+    "get_shipping_options": ToolStatus(
         "Loading shipping methods...",
         "Shipping options ready",
         "suitcase",
     ),
-    "get_retention_offers": (
+    "get_retention_offers": ToolStatus(
         "Checking available offers...",
         "Offers loaded",
         "star",
     ),
     
     # Return creation
-    "create_return_request": (
+    "create_return_request": ToolStatus(
         "Creating return request...",
         "Return created",
         "write",
     ),
-    "finalize_return_from_session": (
+    "finalize_return_from_session": ToolStatus(
         "Finalizing your return...",
         "Return confirmed",
         "check-circle-filled",
     ),
     
     # Session management
-    "set_user_selection": (
+    "set_user_selection": ToolStatus(
         "Saving your selection...",
         "Selection recorded",
         "check",
     ),
-    "select_item_for_return": (
+    "select_item_for_return": ToolStatus(
         "Selecting item...",
         "Item selected",
         "cube",
     ),
-    "return_multiple_items": (
+    "return_multiple_items": ToolStatus(
         "Processing items...",
         "Items ready for return",
         "cube",
     ),
     
     # Refund operations
-    "calculate_refund_amount": (
+    "calculate_refund_amount": ToolStatus(
         "Calculating refund...",
         "Refund calculated",
         "analytics",
     ),
-    "get_customer_return_history": (
+    "get_customer_return_history": ToolStatus(
         "Loading return history...",
         "History retrieved",
         "clock",
     ),
     
     # Policy search (RAG)
-    "file_search": (
+    "file_search": ToolStatus(
         "Searching policy documents...",
         "Policy information found",
         "book-open",
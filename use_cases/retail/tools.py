@@ -7,315 +7,418 @@ the AI assistant to perform actions in the retail returns flow.
 
 import json
 import logging
-from typing import Any, Dict, List
+import threading
+import time
+from functools import partial
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from .cosmos_client import get_retail_client
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+# Compact, non-ASCII-escaping output to match orjson; unknown types become strings
+_dumps = partial(json.dumps, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _to_json(obj: Any) -> str:
+    """Serialize a tool result to a JSON string, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            # Types orjson rejects (e.g. ints beyond 64 bits) go through json
+            pass
+    return _dumps(obj)
+
+
 # =============================================================================
 # TOOL DEFINITIONS (for OpenAI function calling)
 # =============================================================================
 
-RETAIL_TOOLS = [
-    {
-        "type": "function",
-        "function": {
-            "name": "lookup_customer",
-            "description": "Look up a customer by name, email, or phone number. Use this when the customer identifies themselves.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "search_term": {
-                        "type": "string",
-                        "description": "The customer's name, email address, or phone number to search for",
-                    },
-                },
-                "required": ["search_term"],
-            },
-        },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_customer_orders",
-            "description": "Get all orders for a customer. Use this after identifying the customer to show their order history.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "The customer's unique ID (e.g., CUST-1001)",
-                    },
-                },
-                "required": ["customer_id"],
-            },
-        },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_returnable_items",
-            "description": "Get items that are eligible for return for a customer. Shows orders with items still within the return window.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "The customer's unique ID",
-                    },
-                },
-                "required": ["customer_id"],
-            },
-        },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "check_return_eligibility",
-            "description": "Check if a specific item from an order can be returned and get the return window details.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "order_id": {
-                        "type": "string",
-                        "description": "The order ID containing the item",
-                    },
-                    "product_id": {
-                        "type": "string",
-                        "description": "The product ID to check",
-                    },
-                },
-                "required": ["order_id", "product_id"],
-            },
-        },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_return_reasons",
-            "description": "Get the list of available return reasons to present to the customer.",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": [],
-            },
-        },
-    },
-    {
+def _tool(
+    name: str,
+    description: str,
+    properties: Optional[Dict[str, Any]] = None,
+    required: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build an OpenAI function-calling tool definition."""
+    return {
         "type": "function",
         "function": {
-            "name": "get_resolution_options",
-            "description": "Get available resolution options (refund, exchange, store credit) for a return.",
+            "name": name,
+            "description": description,
             "parameters": {
                 "type": "object",
-                "properties": {},
-                "required": [],
+                "properties": properties or {},
+                "required": required or [],
             },
         },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_shipping_options",
-            "description": "Get available return shipping options (prepaid label, drop-off, pickup).",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": [],
-            },
+    }
+
+
+def _param(type_: str, description: str, **schema: Any) -> Dict[str, Any]:
+    """Build a JSON schema for a single tool parameter."""
+    return {"type": type_, "description": description, **schema}
+
+
+RETAIL_TOOLS = [
+    _tool(
+        "lookup_customer",
+        "Look up a customer by name, email, or phone number. Use this when the customer identifies themselves.",
+        {"search_term": _param("string", "The customer's name, email address, or phone number to search for")},
+        ["search_term"],
+    ),
+    _tool(
+        "get_customer_orders",
+        "Get a customer's most recent orders. Use this after identifying the customer to show their order history. For older orders, call again with a larger limit.",
+        {
+            "customer_id": _param("string", "The customer's unique ID (e.g., CUST-1001)"),
+            "limit": _param("integer", "Maximum number of orders to return, newest first (default 20)"),
         },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_retention_offers",
-            "description": "Get available discount offers to retain a customer who wants to return an item. Use when customer mentions they changed their mind.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "The customer's unique ID to check their tier for offers",
-                    },
-                },
-                "required": ["customer_id"],
-            },
+        ["customer_id"],
+    ),
+    _tool(
+        "get_returnable_items",
+        "Get items that are eligible for return for a customer. Shows orders with items still within the return window.",
+        {"customer_id": _param("string", "The customer's unique ID")},
+        ["customer_id"],
+    ),
+    _tool(
+        "check_return_eligibility",
+        "Check if a specific item from an order can be returned and get the return window details.",
+        {
+            "order_id": _param("string", "The order ID containing the item"),
+            "product_id": _param("string", "The product ID to check"),
         },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "create_return_request",
-            "description": "Create a new return request. Use this after collecting all required information from the customer.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "The customer's unique ID",
-                    },
-                    "order_id": {
-                        "type": "string",
-                        "description": "The order ID for the return",
-                    },
-                    "items": {
-                        "type": "array",
-                        "description": "List of items to return",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "product_id": {"type": "string"},
-                                "quantity": {"type": "integer"},
-                                "unit_price": {"type": "number"},
-                            },
-                        },
-                    },
-                    "reason_code": {
-                        "type": "string",
-                        "description": "The return reason code (e.g., DEFECTIVE, WRONG_SIZE)",
-                    },
-                    "reason_details": {
-                        "type": "string",
-                        "description": "Additional details about the return reason",
-                    },
-                    "resolution": {
-                        "type": "string",
-                        "enum": ["refund", "exchange", "store_credit"],
-                        "description": "The chosen resolution type",
-                    },
-                    "shipping_method": {
-                        "type": "string",
-                        "enum": ["prepaid_label", "drop_off", "scheduled_pickup", "keep_item"],
-                        "description": "How the customer will return the item",
+        ["order_id", "product_id"],
+    ),
+    _tool(
+        "get_return_reasons",
+        "Get the list of available return reasons to present to the customer.",
+    ),
+    _tool(
+        "get_resolution_options",
+        "Get available resolution options (refund, exchange, store credit) for a return.",
+    ),
+    _tool(
+        "get_shipping_options",
+        "Get available return shipping options (prepaid label, drop-off, pickup).",
+    ),
+    _tool(
+        "get_retention_offers",
+        "Get available discount offers to retain a customer who wants to return an item. Use when customer mentions they changed their mind.",
+        {"customer_id": _param("string", "The customer's unique ID to check their tier for offers")},
+        ["customer_id"],
+    ),
+    _tool(
+        "create_return_request",
+        "Create a new return request. Use this after collecting all required information from the customer.",
+        {
+            "customer_id": _param("string", "The customer's unique ID"),
+            "order_id": _param("string", "The order ID for the return"),
+            "items": _param(
+                "array",
+                "List of items to return",
+                items={
+                    "type": "object",
+                    "properties": {
+                        "product_id": {"type": "string"},
+                        "quantity": {"type": "integer"},
+                        "unit_price": {"type": "number"},
                     },
                 },
-                "required": ["customer_id", "order_id", "items", "reason_code", "resolution"],
-            },
+            ),
+            "reason_code": _param("string", "The return reason code (e.g., DEFECTIVE, WRONG_SIZE)"),
+            "reason_details": _param("string", "Additional details about the return reason"),
+            "resolution": _param(
+                "string",
+                "The chosen resolution type",
+                enum=["refund", "exchange", "store_credit"],
+            ),
+            "shipping_method": _param(
+                "string",
+                "How the customer will return the item",
+                enum=["prepaid_label", "drop_off", "scheduled_pickup", "keep_item"],
+            ),
         },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_customer_return_history",
-            "description": "Get the return history for a customer to check patterns or previous issues.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "customer_id": {
-                        "type": "string",
-                        "description": "The customer's unique ID",
-                    },
-                },
-                "required": ["customer_id"],
-            },
-        },
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "calculate_refund_amount",
-            "description": "Calculate the refund amount for items being returned.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "items": {
-                        "type": "array",
-                        "description": "Items to calculate refund for",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "unit_price": {"type": "number"},
-                                "quantity": {"type": "integer"},
-                            },
-                        },
-                    },
-                    "customer_tier": {
-                        "type": "string",
-                        "enum": ["Standard", "Silver", "Gold", "Platinum"],
-                        "description": "Customer's membership tier",
-                    },
-                    "reason_code": {
-                        "type": "string",
-                        "description": "The return reason code",
+        ["customer_id", "order_id", "items", "reason_code", "resolution"],
+    ),
+    _tool(
+        "get_customer_return_history",
+        "Get the return history for a customer to check patterns or previous issues.",
+        {"customer_id": _param("string", "The customer's unique ID")},
+        ["customer_id"],
+    ),
+    _tool(
+        "calculate_refund_amount",
+        "Calculate the refund amount for items being returned.",
+        {
+            "items": _param(
+                "array",
+                "Items to calculate refund for",
+                items={
+                    "type": "object",
+                    "properties": {
+                        "unit_price": {"type": "number"},
+                        "quantity": {"type": "integer"},
                     },
                 },
-                "required": ["items"],
-            },
+            ),
+            "customer_tier": _param(
+                "string",
+                "Customer's membership tier",
+                enum=["Standard", "Silver", "Gold", "Platinum"],
+            ),
+            "reason_code": _param("string", "The return reason code"),
         },
-    },
+        ["items"],
+    ),
 ]
 
+# Serialized once at import for callers that send or log the tool schemas.
+# RETAIL_TOOLS must not be mutated after this point.
+RETAIL_TOOLS_JSON = _dumps(RETAIL_TOOLS)
+
 
 # =============================================================================
 # TOOL IMPLEMENTATIONS
 # =============================================================================
 
+# TTL caches map key -> (loaded_at, value). Entries are kept in load order,
+# so expired entries always sit at the front, and every entry in one cache
+# shares one TTL. Stores go through _ttl_store, which evicts them.
+_ttl_lock = threading.Lock()
+
+# Cached reference data
+REFERENCE_DATA_TTL_SECONDS = 60
+_ttl_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def _ttl_lookup(cache: Dict[str, Tuple[float, Any]], key: str, ttl: float) -> Any:
+    """Return the cached value for key, or None if it is missing or older than ttl seconds."""
+    entry = cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+
+def _ttl_store(
+    cache: Dict[str, Tuple[float, Any]],
+    key: str,
+    value: Any,
+    ttl: float,
+    max_entries: Optional[int] = None,
+) -> None:
+    """Cache value under key, first evicting expired entries and, past max_entries, the oldest."""
+    now = time.monotonic()
+    with _ttl_lock:
+        # Re-insert at the end so the dict stays in load order
+        cache.pop(key, None)
+        while cache:
+            oldest = next(iter(cache))
+            if now - cache[oldest][0] < ttl and (max_entries is None or len(cache) < max_entries):
+                break
+            del cache[oldest]
+        cache[key] = (now, value)
+
+
+def _ttl_get(
+    key: str,
+    ttl: float,
+    loader: Callable[[], Any],
+    cache: Dict[str, Tuple[float, Any]] = _ttl_cache,
+    max_entries: Optional[int] = None,
+) -> Any:
+    """Return the cached value for key, calling loader() once it is older than ttl seconds."""
+    value = _ttl_lookup(cache, key, ttl)
+    if value is None:
+        value = loader()
+        _ttl_store(cache, key, value, ttl, max_entries)
+    return value
+
+
+# Shared read-only default for missing nested dicts
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+# Membership tiers in ascending order of privilege
+_TIER_PRIORITY = {"Standard": 1, "Silver": 2, "Gold": 3, "Platinum": 4}
+
+# customer id -> membership tier, filled by customer lookups
+TIER_CACHE_TTL_SECONDS = 60
+TIER_CACHE_MAX_ENTRIES = 1024
+_tier_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def _cache_tier(customer: Dict[str, Any]) -> str:
+    """Cache and return a customer record's membership tier."""
+    tier = customer.get("membership_tier", "Standard")
+    _ttl_store(_tier_cache, customer["id"], tier, TIER_CACHE_TTL_SECONDS, TIER_CACHE_MAX_ENTRIES)
+    return tier
+
+
+def _customer_name(customer: Dict[str, Any]) -> str:
+    """Get a display name from either the "name" or "first_name"/"last_name" format."""
+    return customer.get("name") or f"{customer.get('first_name', '')} {customer.get('last_name', '')}".strip()
+
+
+# Successful customer searches, keyed by the normalized search term. Misses
+# are not cached, so a newly added customer is found on the next search.
+CUSTOMER_CACHE_TTL_SECONDS = 60
+CUSTOMER_CACHE_MAX_ENTRIES = 1024
+_customer_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
 def lookup_customer(search_term: str) -> Dict[str, Any]:
     """Look up a customer by name, email, or phone."""
+    # The search is case-insensitive, so lowercased terms share an entry
+    key = search_term.strip().lower()
+    result = _ttl_lookup(_customer_cache, key, CUSTOMER_CACHE_TTL_SECONDS)
+    if result is not None:
+        return result
+    
     try:
-        logger.info(f"Looking up customer with term: {search_term}")
-        client = get_retail_client()
-        customers = client.search_customers(search_term)
-        logger.info(f"Found {len(customers)} customers")
-        
-        if not customers:
-            return {"found": False, "message": f"No customer found matching '{search_term}'"}
-        
-        if len(customers) == 1:
-            customer = customers[0]
-            # Handle both "name" and "first_name"/"last_name" formats
-            if "name" in customer:
-                customer_name = customer["name"]
-            else:
-                first = customer.get("first_name", "")
-                last = customer.get("last_name", "")
-                customer_name = f"{first} {last}".strip()
-            
-            result = {
-                "found": True,
-                "customer": {
-                    "id": customer["id"],
-                    "name": customer_name,
-                    "email": customer.get("email", ""),
-                    "phone": customer.get("phone", ""),
-                    "tier": customer.get("membership_tier", "Standard"),
-                    "member_since": customer.get("member_since", ""),
-                },
-            }
-            logger.info(f"Returning customer: {result}")
-            return result
-        else:
-            # Multiple customers found
-            customer_list = []
-            for c in customers:
-                if "name" in c:
-                    cname = c["name"]
-                else:
-                    cname = f"{c.get('first_name', '')} {c.get('last_name', '')}".strip()
-                customer_list.append({"id": c["id"], "name": cname, "email": c.get("email", "")})
-            
-            return {
-                "found": True,
-                "multiple": True,
-                "customers": customer_list,
-            }
+        result = _search_customers(key)
     except Exception as e:
-        logger.error(f"Error in lookup_customer: {e}")
+        logger.error("Error in lookup_customer: %s", e)
         return {"found": False, "error": str(e)}
+    
+    if result is None:
+        return {"found": False, "message": f"No customer found matching '{search_term}'"}
+    
+    _ttl_store(_customer_cache, key, result, CUSTOMER_CACHE_TTL_SECONDS, CUSTOMER_CACHE_MAX_ENTRIES)
+    return result
 
 
-def get_customer_orders(customer_id: str) -> Dict[str, Any]:
-    """Get all orders for a customer."""
+def invalidate_customer_lookups() -> None:
+    """Drop cached customer searches so the next lookup re-reads Cosmos DB."""
+    with _ttl_lock:
+        _customer_cache.clear()
+
+
+def _search_customers(search_term: str) -> Optional[Dict[str, Any]]:
+    """
+    Search Cosmos DB for customers, returning None when nothing matches.
+    
+    The result is cached by lookup_customer, so callers must treat it as
+    read-only.
+    """
+    logger.info("Looking up customer with term: %s", search_term)
     client = get_retail_client()
-    orders = client.get_orders_for_customer(customer_id)
+    customers = client.search_customers(search_term)
+    logger.info("Found %d customers", len(customers))
+    
+    if not customers:
+        return None
+    
+    if len(customers) == 1:
+        customer = customers[0]
+        _cache_tier(customer)
+        result = {
+            "found": True,
+            "customer": {
+                "id": customer["id"],
+                "name": _customer_name(customer),
+                "email": customer.get("email", ""),
+                "phone": customer.get("phone", ""),
+                "tier": customer.get("membership_tier", "Standard"),
+                "member_since": customer.get("member_since", ""),
+            },
+        }
+        logger.info("Returning customer: %s", result)
+        return result
+    else:
+        # Multiple customers found
+        customer_list = [
+            {"id": c["id"], "name": _customer_name(c), "email": c.get("email", "")}
+            for c in customers
+        ]
+        
+        return {
+            "found": True,
+            "multiple": True,
+            "customers": customer_list,
+        }
+
+
+# Orders are cached per customer and shared by get_customer_orders,
+# get_returnable_items and check_return_eligibility, which the flow calls
+# back to back. Each cache entry holds (orders, items_by_order): order id ->
+# order, and order id -> {product_id: item}, so both expire together.
+ORDER_CACHE_TTL_SECONDS = 60
+ORDER_CACHE_MAX_CUSTOMERS = 256
+DEFAULT_ORDER_LIMIT = 20
+_OrderEntry = Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, Any]]]]
+_order_cache: Dict[str, Tuple[float, _OrderEntry]] = {}
+
+
+def _orders_for(customer_id: str) -> Dict[str, Dict[str, Any]]:
+    """Get a customer's orders by id, cached for ORDER_CACHE_TTL_SECONDS. Treat as read-only."""
+    return _ttl_get(
+        customer_id,
+        ORDER_CACHE_TTL_SECONDS,
+        lambda: _load_orders(customer_id),
+        cache=_order_cache,
+        max_entries=ORDER_CACHE_MAX_CUSTOMERS,
+    )[0]
+
+
+def _load_orders(customer_id: str) -> _OrderEntry:
+    """Fetch a customer's orders from Cosmos DB and index them by order and product id."""
+    orders = {o["id"]: o for o in get_retail_client().get_orders_for_customer(customer_id)}
+    items_by_order = {
+        order_id: {
+            product_id: item
+            for item in o.get("items", ())
+            if (product_id := item.get("product_id")) is not None
+        }
+        for order_id, o in orders.items()
+    }
+    return orders, items_by_order
+
+
+def _cached_order(order_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]:
+    """Find an order and its items by product id among fresh cached orders, if listed earlier."""
+    now = time.monotonic()
+    # Snapshot the entries; other threads may be storing or evicting
+    for loaded_at, (orders, items_by_order) in tuple(_order_cache.values()):
+        if now - loaded_at < ORDER_CACHE_TTL_SECONDS and order_id in orders:
+            return orders[order_id], items_by_order[order_id]
+    return None
+
+
+def _invalidate_customer(customer_id: str) -> None:
+    """Drop a customer's cached orders and tier so the next call re-reads them."""
+    with _ttl_lock:
+        _order_cache.pop(customer_id, None)
+        _tier_cache.pop(customer_id, None)
+
+
+def get_customer_orders(customer_id: str, limit: int = DEFAULT_ORDER_LIMIT) -> Dict[str, Any]:
+    """
+    Get a customer's most recent orders.
+    
+    Args:
+        customer_id: The customer's unique ID
+        limit: Maximum number of orders to return, newest first
+    """
+    orders = _orders_for(customer_id)
     
     if not orders:
         return {"found": False, "message": "No orders found for this customer"}
     
+    # Orders are cached newest first (the query sorts by order_date DESC)
     return {
         "found": True,
+        "total_orders": len(orders),
         "orders": [
             {
                 "id": o["id"],
@@ -332,7 +435,7 @@ def get_customer_orders(customer_id: str) -> Dict[str, Any]:
                     for item in o.get("items", [])
                 ],
             }
-            for o in orders
+            for o in islice(orders.values(), max(limit, 0))
         ],
     }
 
@@ -340,31 +443,32 @@ def get_customer_orders(customer_id: str) -> Dict[str, Any]:
 def get_returnable_items(customer_id: str) -> Dict[str, Any]:
     """Get items eligible for return."""
     try:
-        logger.info(f"Getting returnable items for customer: {customer_id}")
+        logger.info("Getting returnable items for customer: %s", customer_id)
         client = get_retail_client()
-        orders = client.get_returnable_orders(customer_id)
-        logger.info(f"Found {len(orders)} returnable orders")
+        orders = client.get_returnable_orders(customer_id, orders=_orders_for(customer_id).values())
+        logger.info("Found %d returnable orders", len(orders))
         
         if not orders:
             return {"found": False, "message": "No returnable items found. Items may be outside the return window."}
         
         result_orders = []
         for o in orders:
-            order_items = []
-            for item in o.get("returnable_items", []):
-                try:
-                    eligibility = item.get("return_eligibility", {})
-                    order_items.append({
+            # A malformed item skips its order rather than failing the whole tool
+            try:
+                order_items = [
+                    {
                         "product_id": item.get("product_id", ""),
                         "name": item.get("name", "Unknown Item"),
                         "quantity": item.get("quantity", 1),
                         "unit_price": item.get("unit_price", 0),
-                        "days_remaining": eligibility.get("days_remaining", 30),
+                        "days_remaining": (eligibility := item.get("return_eligibility", _EMPTY)).get("days_remaining", 30),
                         "deadline": eligibility.get("deadline", ""),
-                    })
-                except Exception as e:
-                    logger.warning(f"Error processing item: {e}")
-                    continue
+                    }
+                    for item in o.get("returnable_items", [])
+                ]
+            except Exception as e:
+                logger.warning("Error processing items for order %s: %s", o.get("id", ""), e)
+                continue
             
             if order_items:
                 result_orders.append({
@@ -373,25 +477,31 @@ def get_returnable_items(customer_id: str) -> Dict[str, Any]:
                     "items": order_items,
                 })
         
-        logger.info(f"Returning {len(result_orders)} orders with returnable items")
+        logger.info("Returning %d orders with returnable items", len(result_orders))
         return {
             "found": True,
             "orders": result_orders,
         }
     except Exception as e:
-        logger.error(f"Error in get_returnable_items: {e}")
+        logger.error("Error in get_returnable_items: %s", e)
         return {"found": False, "error": str(e)}
 
 
 def check_return_eligibility(order_id: str, product_id: str) -> Dict[str, Any]:
     """Check if a specific item can be returned."""
     client = get_retail_client()
-    order = client.get_order_by_id(order_id)
     
-    if not order:
-        return {"eligible": False, "reason": "Order not found"}
+    # Prefer the cached copy (and its product index) from an earlier order listing
+    cached = _cached_order(order_id)
+    if cached is not None:
+        order, items_by_product = cached
+        item = items_by_product.get(product_id)
+    else:
+        order = client.get_order_by_id(order_id)
+        if not order:
+            return {"eligible": False, "reason": "Order not found"}
+        item = next((i for i in order.get("items", []) if i["product_id"] == product_id), None)
     
-    item = next((i for i in order.get("items", []) if i["product_id"] == product_id), None)
     if not item:
         return {"eligible": False, "reason": "Item not found in order"}
     
@@ -399,7 +509,17 @@ def check_return_eligibility(order_id: str, product_id: str) -> Dict[str, Any]:
 
 
 def get_return_reasons() -> Dict[str, Any]:
-    """Get available return reasons."""
+    """Get available return reasons.
+    
+    Reference data changes rarely, so the result is cached for
+    REFERENCE_DATA_TTL_SECONDS. Callers must treat the returned dict
+    as read-only.
+    """
+    return _ttl_get("return_reasons", REFERENCE_DATA_TTL_SECONDS, _load_return_reasons)
+
+
+def _load_return_reasons() -> Dict[str, Any]:
+    """Fetch and format return reasons from Cosmos DB."""
     client = get_retail_client()
     reasons = client.get_return_reasons()
     
@@ -417,7 +537,17 @@ def get_return_reasons() -> Dict[str, Any]:
 
 
 def get_resolution_options() -> Dict[str, Any]:
-    """Get available resolution options."""
+    """Get available resolution options.
+    
+    Reference data changes rarely, so the result is cached for
+    REFERENCE_DATA_TTL_SECONDS. Callers must treat the returned dict
+    as read-only.
+    """
+    return _ttl_get("resolution_options", REFERENCE_DATA_TTL_SECONDS, _load_resolution_options)
+
+
+def _load_resolution_options() -> Dict[str, Any]:
+    """Fetch and format resolution options from Cosmos DB."""
     client = get_retail_client()
     options = client.get_resolution_options()
     
@@ -435,7 +565,17 @@ def get_resolution_options() -> Dict[str, Any]:
 
 
 def get_shipping_options() -> Dict[str, Any]:
-    """Get available return shipping options."""
+    """Get available return shipping options.
+    
+    Reference data changes rarely, so the result is cached for
+    REFERENCE_DATA_TTL_SECONDS. Callers must treat the returned dict
+    as read-only.
+    """
+    return _ttl_get("shipping_options", REFERENCE_DATA_TTL_SECONDS, _load_shipping_options)
+
+
+def _load_shipping_options() -> Dict[str, Any]:
+    """Fetch and format return shipping options from Cosmos DB."""
     client = get_retail_client()
     options = client.get_shipping_options()
     
@@ -454,28 +594,34 @@ def get_shipping_options() -> Dict[str, Any]:
 
 def get_retention_offers(customer_id: str) -> Dict[str, Any]:
     """Get discount offers for customer retention."""
-    client = get_retail_client()
-    customer = client.get_customer_by_id(customer_id)
-    offers = client.get_discount_offers()
-    
-    tier = customer.get("membership_tier", "Standard") if customer else "Standard"
+    tier = _ttl_lookup(_tier_cache, customer_id, TIER_CACHE_TTL_SECONDS)
+    if tier is None:
+        customer = get_retail_client().get_customer_by_id(customer_id)
+        tier = _cache_tier(customer) if customer else "Standard"
     
     # Filter offers based on customer tier
-    tier_priority = {"Standard": 1, "Silver": 2, "Gold": 3, "Platinum": 4}
-    customer_priority = tier_priority.get(tier, 1)
+    customer_priority = _TIER_PRIORITY.get(tier, 1)
+    offers = _ttl_get("discount_offers", REFERENCE_DATA_TTL_SECONDS, _load_discount_offers)
+    applicable_offers = [offer for min_priority, offer in offers if min_priority <= customer_priority]
     
-    applicable_offers = []
-    for offer in offers:
-        min_tier = offer.get("min_tier", "Standard")
-        if tier_priority.get(min_tier, 1) <= customer_priority:
-            applicable_offers.append({
+    return {"offers": applicable_offers, "customer_tier": tier}
+
+
+def _load_discount_offers() -> List[Tuple[int, Dict[str, Any]]]:
+    """Fetch discount offers from Cosmos DB as (min tier priority, formatted offer) pairs."""
+    client = get_retail_client()
+    return [
+        (
+            _TIER_PRIORITY.get(offer.get("min_tier", "Standard"), 1),
+            {
                 "code": offer["code"],
                 "label": offer["label"],
                 "description": offer.get("description", ""),
                 "discount_percent": offer.get("discount_percent", 0),
-            })
-    
-    return {"offers": applicable_offers, "customer_tier": tier}
+            },
+        )
+        for offer in client.get_discount_offers()
+    ]
 
 
 def create_return_request(
@@ -491,7 +637,7 @@ def create_return_request(
     client = get_retail_client()
     
     # Calculate refund amount
-    refund_amount = sum(item.get("unit_price", 0) * item.get("quantity", 1) for item in items)
+    refund_amount = _items_subtotal(items)
     
     return_data = {
         "customer_id": customer_id,
@@ -506,6 +652,10 @@ def create_return_request(
     
     result = client.create_return(return_data)
     
+    # The customer's record and orders may have changed with this return
+    invalidate_customer_lookups()
+    _invalidate_customer(customer_id)
+    
     return {
         "success": True,
         "return_id": result["id"],
@@ -536,17 +686,25 @@ def get_customer_return_history(customer_id: str) -> Dict[str, Any]:
     }
 
 
+_RESTOCKING_FEE_EXEMPT_TIERS = frozenset({"Gold", "Platinum"})
+
+
+def _items_subtotal(items: List[Dict[str, Any]]) -> float:
+    """Sum unit_price * quantity over return items."""
+    return sum(item.get("unit_price", 0) * item.get("quantity", 1) for item in items)
+
+
 def calculate_refund_amount(
     items: List[Dict[str, Any]],
     customer_tier: str = "Standard",
     reason_code: str = "",
 ) -> Dict[str, Any]:
     """Calculate the refund amount."""
-    subtotal = sum(item.get("unit_price", 0) * item.get("quantity", 1) for item in items)
+    subtotal = _items_subtotal(items)
     
     # Apply restocking fee for certain reasons (unless premium tier)
     restocking_fee = 0
-    if reason_code == "CHANGED_MIND" and customer_tier not in ["Gold", "Platinum"]:
+    if reason_code == "CHANGED_MIND" and customer_tier not in _RESTOCKING_FEE_EXEMPT_TIERS:
         restocking_fee = subtotal * 0.15  # 15% restocking fee
     
     refund_amount = subtotal - restocking_fee
@@ -563,7 +721,7 @@ def calculate_refund_amount(
 # TOOL EXECUTION
 # =============================================================================
 
-TOOL_FUNCTIONS = {
+TOOL_FUNCTIONS = MappingProxyType({
     "lookup_customer": lookup_customer,
     "get_customer_orders": get_customer_orders,
     "get_returnable_items": get_returnable_items,
@@ -575,17 +733,21 @@ TOOL_FUNCTIONS = {
     "create_return_request": create_return_request,
     "get_customer_return_history": get_customer_return_history,
     "calculate_refund_amount": calculate_refund_amount,
-}
+})
 
 
 def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> str:
     """Execute a tool and return the result as JSON string."""
-    if tool_name not in TOOL_FUNCTIONS:
-        return json.dumps({"error": f"Unknown tool: {tool_name}"})
+    func = TOOL_FUNCTIONS.get(tool_name)
+    if func is None:
+        return _to_json({"error": f"Unknown tool: {tool_name}"})
     
     try:
-        result = TOOL_FUNCTIONS[tool_name](**arguments)
-        return json.dumps(result)
+        # Keyword dispatch also rejects unexpected argument names with a
+        # TypeError, which is reported back to the model below
+        result = func(**arguments)
+        return _to_json(result)
     except Exception as e:
-        logger.error(f"Error executing tool {tool_name}: {e}")
-        return json.dumps({"error": str(e)})
+        logger.error("Error executing tool %s: %s", tool_name, e)
+        return _to_json({"error": str(e)})
+
@@ -10,9 +10,110 @@ Generates rich UI components for the returns flow including:
 - Return confirmation
 """
 
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Sequence
 
 
+# =============================================================================
+# DISPLAY CONSTANTS
+# =============================================================================
+
+_TIER_COLORS = MappingProxyType({
+    "Standard": "#6B7280",  # Gray
+    "Silver": "#9CA3AF",    # Silver
+    "Gold": "#F59E0B",      # Gold
+    "Platinum": "#8B5CF6",  # Purple
+})
+
+# Indexed by (days_remaining > 7) + (days_remaining > 14)
+_URGENCY_INDICATORS = ("🔴", "🟡", "🟢")
+
+_REASON_ICONS = MappingProxyType({
+    "DEFECTIVE": "🔧",
+    "DAMAGED": "📦",
+    "WRONG_ITEM": "❌",
+    "WRONG_SIZE": "📏",
+    "NOT_AS_DESCRIBED": "📝",
+    "CHANGED_MIND": "💭",
+    "OTHER": "❓",
+})
+
+_RESOLUTION_ICONS = MappingProxyType({
+    "refund": "💰",
+    "exchange": "🔄",
+    "store_credit": "🎁",
+    "keep_item": "📦",
+})
+
+# Next steps shown after a return is created, by shipping method
+_NEXT_STEPS = MappingProxyType({
+    "prepaid_label": (
+        "📧 A prepaid shipping label has been sent to your email",
+        "📦 Pack the item securely in its original packaging if possible",
+        "🏪 Drop off at any UPS or FedEx location",
+        "⏱️ Refund will be processed within 3-5 business days after we receive the item",
+    ),
+    "drop_off": (
+        "🏪 Visit any of our partner locations to drop off your return",
+        "📱 Show this return ID at the counter",
+        "⏱️ Refund will be processed within 3-5 business days",
+    ),
+    "scheduled_pickup": (
+        "🚚 A pickup has been scheduled for the next business day",
+        "📦 Have the item ready and packaged",
+        "⏱️ Refund will be processed within 3-5 business days after pickup",
+    ),
+    "keep_item": (
+        "🎁 You can keep the item!",
+        "💰 Your refund will be processed within 1-2 business days",
+        "🙏 Thank you for your patience with this issue",
+    ),
+})
+
+# Store credit bonus by membership tier
+_DEFAULT_STORE_CREDIT_BONUS = 0.05
+_STORE_CREDIT_BONUS = MappingProxyType({
+    "Gold": 0.10,
+    "Platinum": 0.10,
+})
+_STORE_CREDIT_BONUS_LABELS = MappingProxyType({
+    bonus: f"+{int(bonus * 100)}% bonus"
+    for bonus in (_DEFAULT_STORE_CREDIT_BONUS, *_STORE_CREDIT_BONUS.values())
+})
+
+_SHIPPING_ICONS = MappingProxyType({
+    "prepaid_label": "📧",
+    "drop_off": "🏪",
+    "scheduled_pickup": "🚚",
+    "keep_item": "🏠",
+})
+
+_STATUS_COLORS = MappingProxyType({
+    "pending": "#F59E0B",    # Yellow
+    "approved": "#10B981",   # Green
+    "completed": "#6B7280",  # Gray
+    "rejected": "#EF4444",   # Red
+})
+
+_DEFAULT_ERROR_SUGGESTIONS = (
+    "Try searching with a different term",
+    "Contact customer support for assistance",
+)
+
+# Action payload template; copied per item, then the variable fields are set
+_RETURN_ITEM_ACTION = MappingProxyType({
+    "type": "select_return_item",
+    "order_id": "",
+    "product_id": "",
+    "name": "",
+    "unit_price": 0,
+})
+
+
+# =============================================================================
+# WIDGET BUILDERS
+# =============================================================================
+
 def create_customer_card(customer: Dict[str, Any]) -> Dict[str, Any]:
     """
     Create a customer profile card widget.
@@ -20,29 +121,23 @@ def create_customer_card(customer: Dict[str, Any]) -> Dict[str, Any]:
     Shows customer info with their membership tier badge.
     """
     tier = customer.get("tier", "Standard")
-    tier_colors = {
-        "Standard": "#6B7280",  # Gray
-        "Silver": "#9CA3AF",    # Silver
-        "Gold": "#F59E0B",      # Gold
-        "Platinum": "#8B5CF6",  # Purple
-    }
-    
+    customer_id = customer.get("id", "")
     return {
         "type": "card",
         "title": f"👤 {customer.get('name', 'Customer')}",
         "content": {
             "type": "customer_profile",
             "data": {
-                "id": customer.get("id", ""),
+                "id": customer_id,
                 "name": customer.get("name", ""),
                 "email": customer.get("email", ""),
                 "phone": customer.get("phone", ""),
                 "tier": tier,
-                "tier_color": tier_colors.get(tier, "#6B7280"),
+                "tier_color": _TIER_COLORS.get(tier, "#6B7280"),
                 "member_since": customer.get("member_since", ""),
             },
         },
-        "metadata": {"customer_id": customer.get("id", "")},
+        "metadata": {"customer_id": customer_id},
     }
 
 
@@ -56,12 +151,12 @@ def create_customer_selection_widget(customers: List[Dict[str, Any]]) -> Dict[st
         "description": "Please select the correct customer:",
         "options": [
             {
-                "id": c.get("id", ""),
+                "id": (customer_id := c.get("id", "")),
                 "label": c.get("name", ""),
                 "sublabel": c.get("email", ""),
                 "action": {
                     "type": "select_customer",
-                    "customer_id": c.get("id", ""),
+                    "customer_id": customer_id,
                 },
             }
             for c in customers
@@ -78,15 +173,15 @@ def create_orders_list_widget(orders: List[Dict[str, Any]]) -> Dict[str, Any]:
         "title": "📦 Your Orders",
         "items": [
             {
-                "id": order.get("id", ""),
-                "title": f"Order {order.get('id', '')}",
-                "subtitle": f"{order.get('order_date', '')[:10]} • {order.get('status', '').title()}",
+                "id": (order_id := order.get("id", "")),
+                "title": f"Order {order_id}",
+                "subtitle": f"{order.get('order_date', '')[:10]} • {(status := order.get('status', '')).title()}",
                 "details": [
                     f"{item.get('name', '')} (x{item.get('quantity', 1)})"
                     for item in order.get("items", [])
                 ],
                 "total": f"${order.get('total', 0):.2f}",
-                "status": order.get("status", ""),
+                "status": status,
             }
             for order in orders
         ],
@@ -100,28 +195,34 @@ def create_returnable_items_widget(orders: List[Dict[str, Any]]) -> Dict[str, An
     Shows items with their return eligibility and days remaining.
     """
     items = []
+    append = items.append
     for order in orders:
-        for item in order.get("items", []):
-            days = item.get("days_remaining", 0)
-            urgency = "🟢" if days > 14 else "🟡" if days > 7 else "🔴"
+        order_id = order.get("id", "")
+        for item in order.get("items", ()):
+            get = item.get
+            product_id = get("product_id", "")
+            name = get("name", "")
+            unit_price = get("unit_price", 0)
+            days = get("days_remaining", 0)
+            urgency = _URGENCY_INDICATORS[(days > 7) + (days > 14)]
+            
+            action = _RETURN_ITEM_ACTION.copy()
+            action["order_id"] = order_id
+            action["product_id"] = product_id
+            action["name"] = name
+            action["unit_price"] = unit_price
             
-            items.append({
-                "id": f"{order.get('id', '')}|{item.get('product_id', '')}",
-                "order_id": order.get("id", ""),
-                "product_id": item.get("product_id", ""),
-                "name": item.get("name", ""),
-                "quantity": item.get("quantity", 1),
-                "unit_price": item.get("unit_price", 0),
+            append({
+                "id": f"{order_id}|{product_id}",
+                "order_id": order_id,
+                "product_id": product_id,
+                "name": name,
+                "quantity": get("quantity", 1),
+                "unit_price": unit_price,
                 "days_remaining": days,
                 "urgency_indicator": urgency,
-                "deadline": item.get("deadline", ""),
-                "action": {
-                    "type": "select_return_item",
-                    "order_id": order.get("id", ""),
-                    "product_id": item.get("product_id", ""),
-                    "name": item.get("name", ""),
-                    "unit_price": item.get("unit_price", 0),
-                },
+                "deadline": get("deadline", ""),
+                "action": action,
             })
     
     return {
@@ -137,32 +238,21 @@ def create_return_reasons_widget(reasons: List[Dict[str, Any]]) -> Dict[str, Any
     """
     Create a widget for selecting return reason.
     """
-    # Group reasons by category
-    icons = {
-        "DEFECTIVE": "🔧",
-        "DAMAGED": "📦",
-        "WRONG_ITEM": "❌",
-        "WRONG_SIZE": "📏",
-        "NOT_AS_DESCRIBED": "📝",
-        "CHANGED_MIND": "💭",
-        "OTHER": "❓",
-    }
-    
     return {
         "type": "option_selector",
         "title": "❓ Reason for Return",
         "description": "Please select the reason for your return:",
         "options": [
             {
-                "code": r.get("code", ""),
+                "code": (code := r.get("code", "")),
                 "label": r.get("label", ""),
                 "description": r.get("description", ""),
-                "icon": icons.get(r.get("code", ""), "📋"),
-                "requires_details": r.get("requires_details", False),
+                "icon": _REASON_ICONS.get(code, "📋"),
+                "requires_details": (requires_details := r.get("requires_details", False)),
                 "action": {
                     "type": "select_reason",
-                    "reason_code": r.get("code", ""),
-                    "requires_details": r.get("requires_details", False),
+                    "reason_code": code,
+                    "requires_details": requires_details,
                 },
             }
             for r in reasons
@@ -178,39 +268,34 @@ def create_resolution_options_widget(
     """
     Create a widget for selecting return resolution.
     """
-    icons = {
-        "refund": "💰",
-        "exchange": "🔄",
-        "store_credit": "🎁",
-        "keep_item": "📦",
-    }
-    
     # Add bonus for store credit
-    store_credit_bonus = 0.10 if customer_tier in ["Gold", "Platinum"] else 0.05
+    store_credit_bonus = _STORE_CREDIT_BONUS.get(customer_tier, _DEFAULT_STORE_CREDIT_BONUS)
+    bonus_label = _STORE_CREDIT_BONUS_LABELS[store_credit_bonus]
     
     enhanced_options = []
     for opt in options:
+        code = opt.get("code", "")
         option = {
-            "code": opt.get("code", ""),
+            "code": code,
             "label": opt.get("label", ""),
             "description": opt.get("description", ""),
             "processing_time": opt.get("processing_time", ""),
-            "icon": icons.get(opt.get("code", ""), "✓"),
+            "icon": _RESOLUTION_ICONS.get(code, "✓"),
             "action": {
                 "type": "select_resolution",
-                "resolution": opt.get("code", ""),
+                "resolution": code,
             },
         }
         
         # Add amounts for refund and store credit
-        if opt.get("code") == "refund":
+        if code == "refund":
             option["amount"] = refund_amount
             option["amount_display"] = f"${refund_amount:.2f}"
-        elif opt.get("code") == "store_credit":
+        elif code == "store_credit":
             bonus_amount = refund_amount * (1 + store_credit_bonus)
             option["amount"] = bonus_amount
             option["amount_display"] = f"${bonus_amount:.2f}"
-            option["bonus"] = f"+{int(store_credit_bonus * 100)}% bonus"
+            option["bonus"] = bonus_label
         
         enhanced_options.append(option)
     
@@ -227,28 +312,21 @@ def create_shipping_options_widget(options: List[Dict[str, Any]]) -> Dict[str, A
     """
     Create a widget for selecting return shipping method.
     """
-    icons = {
-        "prepaid_label": "📧",
-        "drop_off": "🏪",
-        "scheduled_pickup": "🚚",
-        "keep_item": "🏠",
-    }
-    
     return {
         "type": "shipping_selector",
         "title": "📬 Return Shipping Method",
         "description": "How would you like to return the item?",
         "options": [
             {
-                "code": opt.get("code", ""),
+                "code": (code := opt.get("code", "")),
                 "label": opt.get("label", ""),
                 "description": opt.get("description", ""),
-                "cost": opt.get("cost", 0),
-                "cost_display": "Free" if opt.get("cost", 0) == 0 else f"${opt.get('cost', 0):.2f}",
-                "icon": icons.get(opt.get("code", ""), "📦"),
+                "cost": (cost := opt.get("cost", 0)),
+                "cost_display": "Free" if cost == 0 else f"${cost:.2f}",
+                "icon": _SHIPPING_ICONS.get(code, "📦"),
                 "action": {
                     "type": "select_shipping",
-                    "shipping_method": opt.get("code", ""),
+                    "shipping_method": code,
                 },
             }
             for opt in options
@@ -270,13 +348,13 @@ def create_retention_offer_widget(
         "description": f"We'd love for you to keep your {item_name}. As a {customer_tier} member, here are some exclusive offers:",
         "offers": [
             {
-                "code": offer.get("code", ""),
+                "code": (code := offer.get("code", "")),
                 "label": offer.get("label", ""),
                 "description": offer.get("description", ""),
                 "discount": f"{offer.get('discount_percent', 0)}% off",
                 "action": {
                     "type": "accept_offer",
-                    "offer_code": offer.get("code", ""),
+                    "offer_code": code,
                 },
             }
             for offer in offers
@@ -295,8 +373,14 @@ def create_return_summary_widget(
     """
     Create a summary widget before final confirmation.
     """
-    items = return_data.get("items", [])
-    total = sum(item.get("unit_price", 0) * item.get("quantity", 1) for item in items)
+    # One pass builds the item lines and the fallback total
+    item_lines = []
+    total = 0
+    for item in return_data.get("items", ()):
+        quantity = item.get("quantity", 1)
+        unit_price = item.get("unit_price", 0)
+        total += unit_price * quantity
+        item_lines.append(f"{item.get('name', '')} (x{quantity}) - ${unit_price:.2f}")
     
     return {
         "type": "summary_card",
@@ -312,10 +396,7 @@ def create_return_summary_widget(
             },
             {
                 "title": "Items",
-                "items": [
-                    f"{item.get('name', '')} (x{item.get('quantity', 1)}) - ${item.get('unit_price', 0):.2f}"
-                    for item in items
-                ],
+                "items": item_lines,
             },
             {
                 "title": "Reason",
@@ -359,38 +440,13 @@ def create_return_confirmation_widget(
     return_id = return_result.get("return_id", "")
     refund_amount = return_result.get("refund_amount", 0)
     
-    # Different next steps based on shipping method
-    next_steps = {
-        "prepaid_label": [
-            "📧 A prepaid shipping label has been sent to your email",
-            "📦 Pack the item securely in its original packaging if possible",
-            "🏪 Drop off at any UPS or FedEx location",
-            "⏱️ Refund will be processed within 3-5 business days after we receive the item",
-        ],
-        "drop_off": [
-            "🏪 Visit any of our partner locations to drop off your return",
-            "📱 Show this return ID at the counter",
-            "⏱️ Refund will be processed within 3-5 business days",
-        ],
-        "scheduled_pickup": [
-            "🚚 A pickup has been scheduled for the next business day",
-            "📦 Have the item ready and packaged",
-            "⏱️ Refund will be processed within 3-5 business days after pickup",
-        ],
-        "keep_item": [
-            "🎁 You can keep the item!",
-            "💰 Your refund will be processed within 1-2 business days",
-            "🙏 Thank you for your patience with this issue",
-        ],
-    }
-    
     return {
         "type": "confirmation_card",
         "title": "✅ Return Created Successfully!",
         "return_id": return_id,
         "status": "Pending",
         "refund_amount": f"${refund_amount:.2f}",
-        "next_steps": next_steps.get(shipping_method, next_steps["prepaid_label"]),
+        "next_steps": list(_NEXT_STEPS.get(shipping_method, _NEXT_STEPS["prepaid_label"])),
         "tracking": {
             "enabled": shipping_method != "keep_item",
             "message": "You'll receive tracking updates via email",
@@ -409,7 +465,7 @@ def create_return_confirmation_widget(
     }
 
 
-def create_error_widget(message: str, suggestions: List[str] = None) -> Dict[str, Any]:
+def create_error_widget(message: str, suggestions: Optional[Sequence[str]] = None) -> Dict[str, Any]:
     """
     Create an error widget with helpful suggestions.
     """
@@ -417,10 +473,7 @@ def create_error_widget(message: str, suggestions: List[str] = None) -> Dict[str
         "type": "error_card",
         "title": "⚠️ Unable to Process",
         "message": message,
-        "suggestions": suggestions or [
-            "Try searching with a different term",
-            "Contact customer support for assistance",
-        ],
+        "suggestions": suggestions or _DEFAULT_ERROR_SUGGESTIONS,
         "actions": [
             {
                 "type": "retry",
@@ -438,13 +491,6 @@ def create_return_history_widget(returns: List[Dict[str, Any]]) -> Dict[str, Any
     """
     Create a widget showing customer's return history.
     """
-    status_colors = {
-        "pending": "#F59E0B",    # Yellow
-        "approved": "#10B981",   # Green
-        "completed": "#6B7280",  # Gray
-        "rejected": "#EF4444",   # Red
-    }
-    
     return {
         "type": "history_list",
         "title": "📜 Return History",
@@ -452,10 +498,10 @@ def create_return_history_widget(returns: List[Dict[str, Any]]) -> Dict[str, Any
             {
                 "id": r.get("id", ""),
                 "order_id": r.get("order_id", ""),
-                "status": r.get("status", "pending"),
-                "status_color": status_colors.get(r.get("status", "pending"), "#6B7280"),
+                "status": (status := r.get("status", "pending")),
+                "status_color": _STATUS_COLORS.get(status, "#6B7280"),
                 "reason": r.get("reason", ""),
-                "created_at": r.get("created_at", "")[:10] if r.get("created_at") else "",
+                "created_at": created_at[:10] if (created_at := r.get("created_at")) else "",
                 "refund_amount": f"${r.get('refund_amount', 0):.2f}",
             }
             for r in returns
@@ -13,18 +13,26 @@ This is a GENERIC framework - each domain use case provides its own tool status
 messages. See use_cases/retail/tool_status.py for an example.
 
 Usage:
-    from workflow_status import create_tool_status_hooks
+    from workflow_status import create_tool_status_hooks, tool_status_tracking
     from use_cases.retail.tool_status import RETAIL_TOOL_STATUS_MESSAGES
     
     hooks, tracker = create_tool_status_hooks(
         agent_context,
         tool_messages=RETAIL_TOOL_STATUS_MESSAGES
     )
+    with tool_status_tracking(tracker):
+        result = Runner.run_streamed(agent, input, hooks=hooks)
 """
 
+import asyncio
 import logging
-from typing import Any, AsyncIterator, Dict, Optional
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any, AsyncIterator, DefaultDict, Deque, Dict, Iterator, Mapping, NamedTuple, Optional, Set, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from chatkit.types import Workflow, CustomTask, CustomSummary, ThreadStreamEvent
 from chatkit.agents import AgentContext, stream_agent_response
@@ -40,14 +48,22 @@ logger = logging.getLogger(__name__)
 # DEFAULT TOOL STATUS (used when no custom mapping is provided)
 # =============================================================================
 
-DEFAULT_TOOL_STATUS = (
+class ToolStatus(NamedTuple):
+    """Status messages shown in the workflow indicator for one tool."""
+    
+    start: str
+    end: str
+    icon: str
+
+
+DEFAULT_TOOL_STATUS = ToolStatus(
     "Processing...",
     "Done",
     "sparkle",
 )
 
-# Valid ChatKit icons reference (for documentation):
-VALID_ICONS = [
+# Valid ChatKit icons reference (a set, so it can also back membership checks):
+VALID_ICONS = frozenset({
     'agent', 'analytics', 'atom', 'batch', 'bolt', 'book-open', 'book-closed', 
     'book-clock', 'bug', 'calendar', 'chart', 'check', 'check-circle', 'check-circle-filled', 
     'clock', 'compass', 'confetti', 'cube', 'desktop', 'document', 'dot', 'globe', 'keys', 
@@ -55,10 +71,10 @@ VALID_ICONS = [
     'name', 'notebook', 'page-blank', 'phone', 'play', 'plus', 'profile', 'profile-card', 
     'reload', 'star', 'search', 'sparkle', 'sparkle-double', 'square-code', 'square-image', 
     'square-text', 'suitcase', 'settings-slider', 'user', 'wreath', 'write'
-]
+})
 
 
-def get_tool_status(tool_name: str, tool_messages: Dict[str, tuple] = None) -> tuple:
+def get_tool_status(tool_name: str, tool_messages: Dict[str, ToolStatus] = None) -> ToolStatus:
     """Get the status messages for a tool.
     
     The OpenAI Agents SDK adds a 'tool_' prefix to function names,
@@ -66,15 +82,13 @@ def get_tool_status(tool_name: str, tool_messages: Dict[str, tuple] = None) -> t
     
     Args:
         tool_name: The tool name (may have 'tool_' prefix)
-        tool_messages: Optional custom mapping of tool names to status tuples
+        tool_messages: Optional custom mapping of tool names to ToolStatus tuples
         
     Returns:
-        Tuple of (start_message, end_message, icon)
+        ToolStatus of (start, end, icon)
     """
     # Strip the 'tool_' prefix added by the SDK
-    clean_name = tool_name
-    if tool_name.startswith("tool_"):
-        clean_name = tool_name[5:]  # Remove 'tool_' prefix
+    clean_name = tool_name.removeprefix("tool_")
     
     if tool_messages:
         return tool_messages.get(clean_name, DEFAULT_TOOL_STATUS)
@@ -85,7 +99,48 @@ def get_tool_status(tool_name: str, tool_messages: Dict[str, tuple] = None) -> t
 # WORKFLOW STATUS TRACKER
 # =============================================================================
 
-@dataclass
+# Completed-task template; only the title varies, so copies skip validation
+_COMPLETED_TASK_TEMPLATE = CustomTask(
+    type="custom",
+    title="",
+    icon="check-circle-filled",
+    content=None,
+)
+
+
+_EMPTY_STATUS_TABLE: Mapping[str, ToolStatus] = MappingProxyType({})
+
+
+@lru_cache(maxsize=32)
+def _build_status_table(items: Tuple[Tuple[str, ToolStatus], ...]) -> Mapping[str, ToolStatus]:
+    """
+    Build a read-only raw tool name -> ToolStatus table for a tool_messages snapshot.
+    
+    Keyed on an immutable snapshot of the mapping's items, so trackers for
+    an unchanged mapping share one table and an edited mapping gets a new one.
+    """
+    # Pre-resolve the SDK's "tool_"-prefixed names (and unprefixed names
+    # that get_tool_status would map to themselves) for known tools
+    table = {}
+    for name, status in items:
+        table[f"tool_{name}"] = status
+        if not name.startswith("tool_"):
+            table[name] = status
+    return MappingProxyType(table)
+
+
+@lru_cache(maxsize=32)
+def _workflow_template(summary: str, icon: str) -> Workflow:
+    """Empty workflow shell per header; trackers copy it rather than rebuild it."""
+    return Workflow(
+        type="custom",
+        tasks=[],
+        summary=CustomSummary(title=summary, icon=icon),
+        expanded=True,
+    )
+
+
+@dataclass(slots=True)
 class ToolExecutionTracker:
     """Tracks tool executions for workflow status updates.
     
@@ -94,66 +149,122 @@ class ToolExecutionTracker:
     """
     
     agent_context: Optional[AgentContext] = None
-    tool_messages: Dict[str, tuple] = field(default_factory=dict)
+    tool_messages: Optional[Dict[str, ToolStatus]] = None
     current_workflow_started: bool = False
     tool_count: int = 0
-    tool_task_indices: Dict[str, int] = field(default_factory=dict)
+    # Open task indices per tool, oldest first, so repeated calls to the same
+    # tool each complete their own task. Created on the first tool call, since
+    # most turns never call a tool
+    tool_task_indices: Optional[DefaultDict[str, Deque[int]]] = None
     has_thinking_task: bool = False
     workflow_summary: str = "Working on it..."
     workflow_icon: str = "sparkle"
+    # Read-only raw tool name -> ToolStatus table, looked up on the first
+    # tool call (see _build_status_table)
+    _status_table: Optional[Mapping[str, ToolStatus]] = field(default=None, init=False, repr=False)
     
-    async def start_workflow_if_needed(self):
+    async def start_workflow_if_needed(self, initial_task: Optional[CustomTask] = None) -> bool:
         """Start a workflow if not already started.
         
         Called automatically when the first tool is executed.
+        
+        Args:
+            initial_task: Optional first task to include in the new workflow,
+                so it is streamed with the workflow instead of as a separate
+                task-added update
+        
+        Returns:
+            True if a workflow was started (and initial_task, if given, added)
         """
         if self.agent_context and not self.current_workflow_started:
-            workflow = Workflow(
-                type="custom",
-                tasks=[],
-                summary=CustomSummary(title=self.workflow_summary, icon=self.workflow_icon),
-                expanded=True,
+            workflow = _workflow_template(self.workflow_summary, self.workflow_icon).model_copy(
+                update={"tasks": [initial_task] if initial_task is not None else []},
+                deep=True,
             )
             await self.agent_context.start_workflow(workflow)
             self.current_workflow_started = True
             logger.debug("Started workflow for tool execution tracking")
+            return True
+        return False
+    
+    def _get_status(self, tool_name: str) -> ToolStatus:
+        """Resolve the ToolStatus for a raw tool name."""
+        table = self._status_table
+        if table is None:
+            table = self._status_table = (
+                _build_status_table(tuple(self.tool_messages.items()))
+                if self.tool_messages else _EMPTY_STATUS_TABLE
+            )
+        status = table.get(tool_name)
+        if status is None:
+            status = get_tool_status(tool_name, self.tool_messages)
+        return status
     
     async def add_tool_task(self, tool_name: str, is_start: bool = True):
         """Add or update a task for a tool execution."""
         if not self.agent_context:
             return
             
-        start_msg, end_msg, icon = get_tool_status(tool_name, self.tool_messages)
+        status = self._get_status(tool_name)
         
         if is_start:
-            # Start workflow on first tool call (lazy initialization)
-            await self.start_workflow_if_needed()
-            
-            # Add new task for this tool
-            task_index = self.tool_count
-            self.tool_task_indices[tool_name] = task_index
-            self.tool_count += 1
-            
             task = CustomTask(
                 type="custom",
-                title=start_msg,
-                icon=icon,
+                title=status.start,
+                icon=status.icon,
                 content=None,
             )
-            await self.agent_context.add_workflow_task(task)
-            logger.debug(f"Added workflow task at index {task_index}: {start_msg}")
+            
+            # Start workflow on first tool call (lazy initialization); the
+            # first task goes out with the workflow itself. Once started, skip
+            # the call entirely rather than re-checking inside it
+            started = (
+                not self.current_workflow_started
+                and await self.start_workflow_if_needed(task)
+            )
+            
+            # Track the task index for this tool
+            task_index = self.tool_count
+            indices = self.tool_task_indices
+            if indices is None:
+                indices = self.tool_task_indices = defaultdict(deque)
+            indices[tool_name].append(task_index)
+            self.tool_count += 1
+            
+            if not started:
+                await self.agent_context.add_workflow_task(task)
+            logger.debug("Added workflow task at index %d: %s", task_index, status.start)
         else:
             # Update the task to show completion using tracked index
-            task_index = self.tool_task_indices.get(tool_name)
-            if task_index is not None:
-                task = CustomTask(
-                    type="custom",
-                    title=f"✓ {end_msg}",
-                    icon="check-circle-filled",
-                    content=None,
-                )
+            indices = self.tool_task_indices
+            pending = indices.get(tool_name) if indices else None
+            if pending:
+                task_index = pending.popleft()
+                task = _COMPLETED_TASK_TEMPLATE.model_copy(update={"title": f"✓ {status.end}"})
                 await self.agent_context.update_workflow_task(task, task_index)
-                logger.debug(f"Updated workflow task at index {task_index}: {end_msg}")
+                logger.debug("Updated workflow task at index %d: %s", task_index, status.end)
+    
+    async def add_completed_tool_task(self, tool_name: str):
+        """Add a single, already completed task for a tool.
+        
+        Used when a tool finishes before its start was shown, so the UI gets
+        one write instead of an add immediately followed by an update.
+        """
+        if not self.agent_context:
+            return
+        
+        status = self._get_status(tool_name)
+        task = _COMPLETED_TASK_TEMPLATE.model_copy(update={"title": f"✓ {status.end}"})
+        started = (
+            not self.current_workflow_started
+            and await self.start_workflow_if_needed(task)
+        )
+        task_index = self.tool_count
+        self.tool_count += 1
+        
+        if not started:
+            await self.agent_context.add_workflow_task(task)
+        logger.debug("Added completed workflow task at index %d: %s", task_index, status.end)
     
     async def end_workflow_if_started(self):
         """End the workflow if it was started."""
@@ -162,14 +273,41 @@ class ToolExecutionTracker:
                 await self.agent_context.end_workflow(expanded=False)
             except ValueError as e:
                 # Workflow may have been cleared by streaming - that's OK
-                logger.debug(f"Workflow already ended: {e}")
+                logger.debug("Workflow already ended: %s", e)
             
             self.current_workflow_started = False
             self.tool_count = 0
-            self.tool_task_indices.clear()
+            self.tool_task_indices = None
             logger.debug("Ended workflow")
 
 
+# Tracker for the current turn, read by the shared ToolStatusHooks. Set it
+# with tool_status_tracking() around Runner.run_streamed: the SDK starts the
+# agent loop with asyncio.create_task, which copies the context at that point,
+# so each run keeps its own tracker and concurrent turns stay apart
+_CURRENT_TRACKER: ContextVar[Optional[ToolExecutionTracker]] = ContextVar("tool_status_tracker", default=None)
+
+
+@contextmanager
+def tool_status_tracking(tracker: ToolExecutionTracker) -> Iterator[ToolExecutionTracker]:
+    """
+    Route tool status hooks to tracker for runs started inside this block.
+    
+    Only the Runner.run_streamed call needs to be inside; the run captures
+    the tracker when it starts. The previous value is restored on exit.
+    
+    Usage:
+        hooks, tracker = create_tool_status_hooks(agent_context)
+        with tool_status_tracking(tracker):
+            result = Runner.run_streamed(agent, input, hooks=hooks)
+    """
+    token = _CURRENT_TRACKER.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _CURRENT_TRACKER.reset(token)
+
+
 # =============================================================================
 # TOOL STATUS HOOKS (implements OpenAI Agents SDK RunHooks)
 # =============================================================================
@@ -180,9 +318,11 @@ class ToolStatusHooks(RunHooks):
     
     This is a generic implementation that works with any domain use case.
     The actual status messages come from the ToolExecutionTracker's tool_messages.
+    The hooks hold no state of their own; each callback updates the tracker
+    of the current turn, so one shared instance serves every run.
     
     Example:
-        from workflow_status import create_tool_status_hooks
+        from workflow_status import create_tool_status_hooks, tool_status_tracking
         from use_cases.retail.tool_status import RETAIL_TOOL_STATUS_MESSAGES
         
         hooks, tracker = create_tool_status_hooks(
@@ -190,16 +330,16 @@ class ToolStatusHooks(RunHooks):
             tool_messages=RETAIL_TOOL_STATUS_MESSAGES
         )
         
-        result = Runner.run_streamed(
-            agent,
-            input,
-            context=agent_context,
-            hooks=hooks,
-        )
+        with tool_status_tracking(tracker):
+            result = Runner.run_streamed(
+                agent,
+                input,
+                context=agent_context,
+                hooks=hooks,
+            )
     """
     
-    def __init__(self, tracker: ToolExecutionTracker):
-        self.tracker = tracker
+    __slots__ = ()
     
     async def on_tool_start(
         self,
@@ -209,10 +349,13 @@ class ToolStatusHooks(RunHooks):
     ) -> None:
         """Called when a tool starts executing."""
         tool_name = tool.name
-        logger.info(f"Tool starting: {tool_name}")
+        logger.info("Tool starting: %s", tool_name)
         
-        # Add task for this tool (workflow starts automatically on first tool)
-        await self.tracker.add_tool_task(tool_name, is_start=True)
+        # Add task for this tool (workflow starts automatically on first tool);
+        # runs started outside tool_status_tracking() have no tracker
+        tracker = _CURRENT_TRACKER.get()
+        if tracker is not None:
+            await tracker.add_tool_task(tool_name, is_start=True)
     
     async def on_tool_end(
         self,
@@ -223,19 +366,25 @@ class ToolStatusHooks(RunHooks):
     ) -> None:
         """Called when a tool finishes executing."""
         tool_name = tool.name
-        logger.info(f"Tool completed: {tool_name}")
+        logger.info("Tool completed: %s", tool_name)
         
         # Update task to show completion
-        await self.tracker.add_tool_task(tool_name, is_start=False)
+        tracker = _CURRENT_TRACKER.get()
+        if tracker is not None:
+            await tracker.add_tool_task(tool_name, is_start=False)
 
 
 # =============================================================================
 # FACTORY FUNCTION
 # =============================================================================
 
+_NOOP_HOOKS = RunHooks()
+_SHARED_HOOKS = ToolStatusHooks()
+
+
 def create_tool_status_hooks(
     agent_context: AgentContext,
-    tool_messages: Dict[str, tuple] = None,
+    tool_messages: Dict[str, ToolStatus] = None,
     workflow_summary: str = "Working on it...",
     workflow_icon: str = "sparkle",
 ) -> tuple:
@@ -246,13 +395,15 @@ def create_tool_status_hooks(
     
     Args:
         agent_context: The ChatKit AgentContext to stream status to
-        tool_messages: Dict mapping tool names to (start_msg, end_msg, icon) tuples.
+        tool_messages: Dict mapping tool names to ToolStatus(start, end, icon) tuples.
                       If not provided, uses generic "Processing..." / "Done" messages.
         workflow_summary: The header text shown while tools execute (default: "Working on it...")
         workflow_icon: The icon for the workflow header (default: "sparkle")
         
     Returns:
-        A tuple of (hooks, tracker) to pass to Runner.run_streamed
+        A tuple of (hooks, tracker). The hooks are shared across runs and
+        find the tracker through the current context, so start the run inside
+        tool_status_tracking(tracker)
         
     Example (Retail):
         from use_cases.retail.tool_status import RETAIL_TOOL_STATUS_MESSAGES
@@ -261,6 +412,8 @@ def create_tool_status_hooks(
             agent_context,
             tool_messages=RETAIL_TOOL_STATUS_MESSAGES
         )
+        with tool_status_tracking(tracker):
+            result = Runner.run_streamed(agent, input, hooks=hooks)
     
     Example (Healthcare):
         from use_cases.healthcare.tool_status import HEALTHCARE_TOOL_STATUS_MESSAGES
@@ -274,18 +427,39 @@ def create_tool_status_hooks(
     """
     tracker = ToolExecutionTracker(
         agent_context=agent_context,
-        tool_messages=tool_messages or {},
+        tool_messages=tool_messages,
         workflow_summary=workflow_summary,
         workflow_icon=workflow_icon,
     )
-    hooks = ToolStatusHooks(tracker)
-    return hooks, tracker
+    # Without a context there is nothing to stream to, so skip the per-tool
+    # hook work entirely (RunHooks' own callbacks are no-ops)
+    return (_SHARED_HOOKS if agent_context is not None else _NOOP_HOOKS), tracker
 
 
 # =============================================================================
 # STREAMING WITH HOSTED TOOL STATUS (FILE_SEARCH, WEB_SEARCH)
 # =============================================================================
 
+# How long a hosted tool's start is held back; if it completes within this
+# window, only a single completed task is written. This trades up to 50 ms of
+# delay on a hosted tool's "searching" status for one fewer workflow write on
+# fast searches. Only hosted-tool starts are held; completions and local tool
+# updates are never delayed, since holding every status change back for a
+# batch window would make the whole indicator lag
+HOSTED_TOOL_COALESCE_SECONDS = 0.05
+
+# Raw response event type -> (tool name, log label, is_start)
+_HOSTED_TOOL_EVENTS: Dict[str, Tuple[str, str, bool]] = {
+    'response.file_search_call.in_progress': ('file_search', 'File search', True),
+    'response.file_search_call.searching': ('file_search', 'File search', True),
+    'response.file_search_call.completed': ('file_search', 'File search', False),
+    # Web search events (for future use)
+    'response.web_search_call.in_progress': ('web_search', 'Web search', True),
+    'response.web_search_call.searching': ('web_search', 'Web search', True),
+    'response.web_search_call.completed': ('web_search', 'Web search', False),
+}
+
+
 class HostedToolStreamWrapper:
     """
     Wraps a RunResultStreaming to detect hosted tool events (file_search, web_search).
@@ -296,17 +470,108 @@ class HostedToolStreamWrapper:
     
     The wrapper is transparent - it yields all original events while also triggering
     workflow status updates for hosted tools.
+    
+    A hosted tool's start is shown HOSTED_TOOL_COALESCE_SECONDS after it
+    begins, so a search that finishes within that window appears as a single
+    completed task. The cost is that slower searches show their progress
+    status that much later.
     """
     
+    __slots__ = ("_result", "_tracker", "_active_hosted_tools", "_status_task", "_pending_starts")
+    
     def __init__(self, result: RunResultStreaming, tracker: ToolExecutionTracker):
         self._result = result
         self._tracker = tracker
-        self._active_hosted_tools: Dict[str, bool] = {}
+        self._active_hosted_tools: Set[str] = set()
+        # Latest background workflow status update (see _queue_status_update)
+        self._status_task: Optional[asyncio.Task] = None
+        # Hosted tool starts waiting out the coalescing window
+        self._pending_starts: Dict[str, asyncio.TimerHandle] = {}
+    
+    # Frequently read RunResultStreaming attributes, forwarded directly so
+    # they skip the __getattr__ fallback
+    @property
+    def final_output(self) -> Any:
+        return self._result.final_output
+    
+    @property
+    def current_agent(self) -> Agent[Any]:
+        return self._result.current_agent
+    
+    @property
+    def last_agent(self) -> Agent[Any]:
+        return self._result.last_agent
+    
+    @property
+    def new_items(self) -> list:
+        return self._result.new_items
+    
+    @property
+    def raw_responses(self) -> list:
+        return self._result.raw_responses
     
     def __getattr__(self, name):
         """Delegate all other attributes to the wrapped result."""
+        # Protocol lookups (copy, pickle, debuggers) belong to the wrapper;
+        # failing them here also avoids recursing on an unset _result
+        if name.startswith("__"):
+            raise AttributeError(name)
         return getattr(self._result, name)
     
+    def _queue_status_update(self, tool_name: str, is_start: bool, coalesced: bool = False) -> None:
+        """
+        Run a tracker update in the background so the stream isn't held up.
+        
+        Each update waits for the previous one, so a tool's start is always
+        applied before its completion. A coalesced update writes the tool's
+        start and completion as one completed task. Failures are logged here,
+        since nothing else awaits the update's result.
+        """
+        previous = self._status_task
+        
+        async def update():
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            try:
+                if coalesced:
+                    await self._tracker.add_completed_tool_task(tool_name)
+                else:
+                    await self._tracker.add_tool_task(tool_name, is_start=is_start)
+            except Exception as e:
+                logger.warning("Workflow status update for %s failed: %s", tool_name, e)
+        
+        self._status_task = asyncio.create_task(update())
+    
+    def _emit_start(self, tool_name: str) -> None:
+        """
+        Queue a held-back start once its coalescing window has passed.
+        
+        Runs as a loop callback, where a raised exception would only reach
+        the loop's exception handler, so failures are logged here instead.
+        The queued update logs its own failures (see _queue_status_update).
+        """
+        if self._pending_starts.pop(tool_name, None) is None:
+            return
+        try:
+            self._queue_status_update(tool_name, is_start=True)
+        except Exception as e:
+            logger.warning("Could not queue workflow status for %s: %s", tool_name, e)
+    
+    def _on_hosted_tool_transition(self, tool_name: str, is_start: bool) -> None:
+        """Hold starts briefly so quick start/complete pairs become one write."""
+        if is_start:
+            self._pending_starts[tool_name] = asyncio.get_running_loop().call_later(
+                HOSTED_TOOL_COALESCE_SECONDS, self._emit_start, tool_name
+            )
+            return
+        
+        pending = self._pending_starts.pop(tool_name, None)
+        if pending is not None:
+            pending.cancel()
+            self._queue_status_update(tool_name, is_start=False, coalesced=True)
+        else:
+            self._queue_status_update(tool_name, is_start=False)
+    
     async def stream_events(self):
         """
         Wrap stream_events to detect hosted tool events.
@@ -314,43 +579,39 @@ class HostedToolStreamWrapper:
         Yields all original events while also triggering workflow status for:
         - response.file_search_call.in_progress / .searching / .completed
         - response.web_search_call.in_progress / .searching / .completed
+        
+        No extra buffering is done here: the SDK runs the model in a
+        background task that fills an unbounded queue, and
+        RunResultStreaming.stream_events() simply drains it.
         """
-        async for event in self._result.stream_events():
-            # Check for hosted tool events in raw responses
-            if isinstance(event, RawResponsesStreamEvent):
-                raw_event = event.data
-                event_type = getattr(raw_event, 'type', '')
-                
-                # File search events
-                if event_type in ('response.file_search_call.in_progress', 
-                                  'response.file_search_call.searching'):
-                    if 'file_search' not in self._active_hosted_tools:
-                        self._active_hosted_tools['file_search'] = True
-                        await self._tracker.add_tool_task("file_search", is_start=True)
-                        logger.info(f"File search started (event: {event_type})")
-                        
-                elif event_type == 'response.file_search_call.completed':
-                    if 'file_search' in self._active_hosted_tools:
-                        await self._tracker.add_tool_task("file_search", is_start=False)
-                        del self._active_hosted_tools['file_search']
-                        logger.info("File search completed")
+        try:
+            async for event in self._result.stream_events():
+                # Check for hosted tool events in raw responses; all other event
+                # types miss the table with a single dict lookup
+                if type(event) is RawResponsesStreamEvent:
+                    event_type = getattr(event.data, 'type', None)
+                    hosted = _HOSTED_TOOL_EVENTS.get(event_type)
+                    if hosted is not None:
+                        tool_name, label, is_start = hosted
+                        # Only act on transitions: a start while idle or a
+                        # completion while active flips the tool's state
+                        active = self._active_hosted_tools
+                        if is_start is not (tool_name in active):
+                            active ^= {tool_name}
+                            self._on_hosted_tool_transition(tool_name, is_start)
+                            logger.info("%s %s (event: %s)", label, "started" if is_start else "completed", event_type)
                 
-                # Web search events (for future use)
-                elif event_type in ('response.web_search_call.in_progress',
-                                    'response.web_search_call.searching'):
-                    if 'web_search' not in self._active_hosted_tools:
-                        self._active_hosted_tools['web_search'] = True
-                        await self._tracker.add_tool_task("web_search", is_start=True)
-                        logger.info(f"Web search started (event: {event_type})")
-                        
-                elif event_type == 'response.web_search_call.completed':
-                    if 'web_search' in self._active_hosted_tools:
-                        await self._tracker.add_tool_task("web_search", is_start=False)
-                        del self._active_hosted_tools['web_search']
-                        logger.info("Web search completed")
-            
-            # Always yield the original event
-            yield event
+                # Always yield the original event
+                yield event
+        finally:
+            # Flush status updates before the caller ends the workflow,
+            # showing any starts still held back
+            for tool_name, pending in list(self._pending_starts.items()):
+                pending.cancel()
+                self._emit_start(tool_name)
+            # Status bookkeeping must not mask an error from the model stream
+            if self._status_task is not None:
+                await asyncio.gather(self._status_task, return_exceptions=True)
 
 
 def wrap_for_hosted_tools(